@@ -0,0 +1,156 @@
+"""
+Helpers shared by the manual test scripts.
+"""
+
+import os
+import json
+import getpass
+import threading
+from src.utils.logger import get_default_logger
+from src.utils.credential_manager import CredentialManager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# orjson is considerably faster on large nested payloads; fall back to the
+# standard library when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Get logger
+logger = get_default_logger()
+
+# Page readiness indicators used instead of fixed sleeps
+PAGE_BODY = (By.TAG_NAME, "body")
+LOGGED_IN_INDICATOR = (By.CSS_SELECTOR, "nav, svg[aria-label='Home']")
+
+# Credential manager unlocked by get_unlocked_credential_manager
+_credential_manager = None
+_master_password = None
+
+# Credentials decrypted by get_resolved_credentials
+_credentials = None
+
+# Guards the cached credential state when tests run in parallel threads
+_credentials_lock = threading.RLock()
+
+def get_unlocked_credential_manager():
+    """
+    Get a credential manager with encryption set up, unlocking it only once.
+    
+    The key derivation behind setup_encryption is deliberately slow, so the
+    unlocked manager and master password are cached for the rest of the session.
+    
+    Returns:
+        Tuple of (CredentialManager, master password), or (None, None) on failure
+    """
+    with _credentials_lock:
+        return _unlock_credential_manager()
+
+def _unlock_credential_manager():
+    """Resolve and cache the credential manager; caller holds _credentials_lock."""
+    global _credential_manager, _master_password
+    if _credential_manager is not None:
+        return _credential_manager, _master_password
+    
+    credential_manager = CredentialManager()
+    
+    # Try auto setup first
+    if credential_manager.auto_setup_from_env():
+        logger.info("Using automatically set up credentials from environment")
+        master_password = os.getenv("MASTER_PASSWORD")
+    else:
+        # Check if credentials file exists
+        credentials_file = os.path.join("credentials", "encrypted_credentials.json")
+        
+        if not os.path.exists(credentials_file):
+            logger.error("No credentials file found. Please run main.py first to set up credentials.")
+            return None, None
+        
+        # Get master password
+        master_password = getpass.getpass("Enter master password to decrypt credentials: ")
+        if not credential_manager.setup_encryption(master_password):
+            logger.error("Failed to set up encryption with provided master password")
+            return None, None
+    
+    _credential_manager, _master_password = credential_manager, master_password
+    return credential_manager, master_password
+
+def get_resolved_credentials():
+    """
+    Get the decrypted Instagram credentials, resolving them only once.
+    
+    Returns:
+        Tuple of (username, master password, credentials dict), or
+        (None, None, None) if they could not be resolved
+    """
+    global _credentials
+    with _credentials_lock:
+        credential_manager, master_password = get_unlocked_credential_manager()
+        if not credential_manager:
+            return None, None, None
+        
+        if _credentials is None:
+            credentials = credential_manager.get_credentials()
+            if not credentials or not credentials.get("username"):
+                logger.error("Failed to retrieve credentials")
+                return None, None, None
+            _credentials = credentials
+        
+        return _credentials["username"], master_password, _credentials
+
+def forget_credentials():
+    """Drop the cached credential manager, credentials and derived keys."""
+    global _credential_manager, _master_password, _credentials
+    with _credentials_lock:
+        _credential_manager = _master_password = _credentials = None
+        CredentialManager.clear_key_cache()
+
+def wait_for(wait, locator):
+    """
+    Wait for an element to be present, logging instead of raising on timeout.
+    
+    Args:
+        wait: WebDriverWait bound to the browser
+        locator: (By, selector) tuple to wait for
+        
+    Returns:
+        True if the element appeared, False on timeout
+    """
+    try:
+        wait.until(EC.presence_of_element_located(locator))
+        return True
+    except TimeoutException:
+        logger.warning(f"Timed out waiting for {locator[1]}")
+        return False
+
+def dump_debug_json(obj, path):
+    """
+    Write an object to a pretty-printed JSON debug file.
+    
+    Args:
+        obj: JSON-serializable object to write
+        path: Path of the debug file
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+def parse_json(text):
+    """
+    Parse JSON text, using orjson when available.
+    
+    Args:
+        text: JSON text to parse, as str or UTF-8 bytes
+        
+    Returns:
+        The parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
@@ -14,6 +14,8 @@ HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'False').lower() == 'true'
 USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36')
 USER_AGENT_ROTATION = os.getenv('USER_AGENT_ROTATION', 'True').lower() == 'true'
 BROWSER_LANGUAGE = os.getenv('BROWSER_LANGUAGE', 'en-US,en;q=0.9')
+WEBDRIVER_POOL_MAXSIZE = int(os.getenv('WEBDRIVER_POOL_MAXSIZE', '10'))
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '3'))
 
 # Proxy settings
 USE_PROXY = os.getenv('USE_PROXY', 'False').lower() == 'true'
@@ -46,10 +48,14 @@ SESSION_DIR = os.getenv('SESSION_DIR', 'data/sessions')
 FOLLOWER_DATA_PATH = os.path.join(DATA_DIR, 'followers')
 ENGAGEMENT_DATA_PATH = os.path.join(DATA_DIR, 'engagement')
 REPORT_DATA_PATH = os.path.join(DATA_DIR, 'reports')
+COOKIES_DIR = os.getenv('COOKIES_DIR', 'cookies')
+PROFILES_DIR = os.getenv('PROFILES_DIR', os.path.join(DATA_DIR, 'profiles'))
 
 # Create directories if they don't exist
 os.makedirs(FOLLOWER_DATA_PATH, exist_ok=True)
 os.makedirs(ENGAGEMENT_DATA_PATH, exist_ok=True)
 os.makedirs(REPORT_DATA_PATH, exist_ok=True)
 os.makedirs(SESSION_DIR, exist_ok=True)
+os.makedirs(COOKIES_DIR, exist_ok=True)
+os.makedirs(PROFILES_DIR, exist_ok=True)
 os.makedirs(ERROR_SCREENSHOT_DIR, exist_ok=True) 
\ No newline at end of file
@@ -2,6 +2,7 @@ import os
 import json
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 from src.utils.logger import get_default_logger
@@ -9,6 +10,50 @@ from src.utils.logger import get_default_logger
 # Get logger
 logger = get_default_logger()
 
+# Weights of each engagement rate in the overall engagement score
+SCORE_WEIGHTS = {
+    'like_rate': 0.3,
+    'comment_rate': 0.3,
+    'story_view_rate': 0.2,
+    'reel_engagement_rate': 0.1,
+    'active_rate': 0.1
+}
+
+@dataclass
+class PipelineResult:
+    """Counts and exported files from EngagementDataProcessor.run_pipeline()."""
+    follower_count: int = 0
+    ghost_count: int = 0
+    active_count: int = 0
+    definite_count: int = 0
+    probable_count: int = 0
+    possible_count: int = 0
+    export_files: dict = field(default_factory=dict)
+
+def ghost_category(metrics):
+    """
+    Get the ghost category of a follower from their engagement metrics.
+    
+    - Definite ghosts: no engagement at all
+    - Probable ghosts: very low engagement score
+    - Possible ghosts: low engagement score but some activity
+    
+    Args:
+        metrics: Engagement metrics of one follower
+        
+    Returns:
+        'definite_ghosts', 'probable_ghosts', 'possible_ghosts', or None
+    """
+    if metrics['like_count'] == 0 and metrics['comment_count'] == 0 and \
+       metrics['story_view_count'] == 0 and metrics['reel_engagement_count'] == 0 and \
+       metrics['active_now_count'] == 0:
+        return 'definite_ghosts'
+    if metrics['engagement_score'] < 0.05:
+        return 'probable_ghosts'
+    if metrics['engagement_score'] < 0.1:
+        return 'possible_ghosts'
+    return None
+
 class EngagementDataProcessor:
     """
     Processes and analyzes engagement data collected from Instagram.
@@ -252,44 +297,110 @@ class EngagementDataProcessor:
                                 self.engagement_metrics[username]['last_engagement'] = activity_timestamp
         
         # Calculate overall engagement score for each follower
-        for username, metrics in self.engagement_metrics.items():
-            # Calculate engagement rates
-            posts_seen = max(1, metrics['posts_seen'])  # Avoid division by zero
-            stories_seen = max(1, metrics['stories_seen'])
-            reels_seen = max(1, metrics['reels_seen'])
-            activity_checks = max(1, metrics['activity_checks'])
-            
-            like_rate = metrics['like_count'] / posts_seen
-            comment_rate = metrics['comment_count'] / posts_seen
-            story_view_rate = metrics['story_view_count'] / stories_seen
-            reel_engagement_rate = metrics['reel_engagement_count'] / reels_seen
-            active_rate = metrics['active_now_count'] / activity_checks
-            
-            # Calculate recency factor (higher if engaged recently)
-            recency_factor = 1.0
-            if metrics['last_engagement']:
-                last_engagement = datetime.fromisoformat(metrics['last_engagement'])
-                now = datetime.now()
-                days_since_engagement = (now - last_engagement).days
-                
-                # Exponential decay based on days since last engagement
-                recency_factor = np.exp(-0.1 * days_since_engagement)
-            
-            # Calculate overall engagement score (weighted average of all metrics)
-            engagement_score = (
-                0.3 * like_rate +
-                0.3 * comment_rate +
-                0.2 * story_view_rate +
-                0.1 * reel_engagement_rate +
-                0.1 * active_rate
-            ) * recency_factor
-            
-            # Update engagement score
-            self.engagement_metrics[username]['engagement_score'] = engagement_score
+        self._calculate_engagement_scores()
         
         logger.info(f"Calculated engagement metrics for {len(self.engagement_metrics)} followers")
         return True
     
+    def _calculate_engagement_scores(self):
+        """
+        Calculate the engagement score of every follower in one vectorized pass.
+        
+        The per-follower counts are gathered into columns so the rates and the
+        weighted score are computed with numpy across all followers at once.
+        """
+        if not self.engagement_metrics:
+            return
+        
+        metrics_list = list(self.engagement_metrics.values())
+        
+        def column(key):
+            return np.fromiter((m[key] for m in metrics_list), dtype=float, count=len(metrics_list))
+        
+        # Avoid division by zero
+        posts_seen = np.maximum(1, column('posts_seen'))
+        stories_seen = np.maximum(1, column('stories_seen'))
+        reels_seen = np.maximum(1, column('reels_seen'))
+        activity_checks = np.maximum(1, column('activity_checks'))
+        
+        # Days since last engagement (0, i.e. no decay, for followers who never engaged)
+        now = datetime.now()
+        days_since_engagement = np.fromiter(
+            ((now - datetime.fromisoformat(m['last_engagement'])).days if m['last_engagement'] else 0
+             for m in metrics_list),
+            dtype=float, count=len(metrics_list)
+        )
+        
+        # Exponential decay based on days since last engagement
+        recency_factor = np.exp(-0.1 * days_since_engagement)
+        
+        # Overall engagement score (weighted average of all rates)
+        engagement_scores = (
+            SCORE_WEIGHTS['like_rate'] * column('like_count') / posts_seen +
+            SCORE_WEIGHTS['comment_rate'] * column('comment_count') / posts_seen +
+            SCORE_WEIGHTS['story_view_rate'] * column('story_view_count') / stories_seen +
+            SCORE_WEIGHTS['reel_engagement_rate'] * column('reel_engagement_count') / reels_seen +
+            SCORE_WEIGHTS['active_rate'] * column('active_now_count') / activity_checks
+        ) * recency_factor
+        
+        for metrics, engagement_score in zip(metrics_list, engagement_scores.tolist()):
+            metrics['engagement_score'] = engagement_score
+    
+    def run_pipeline(self, threshold=0.1):
+        """
+        Calculate metrics, classify and categorize followers, and export the results.
+        
+        Followers are classified as ghost/active and categorized in a single
+        pass over the metrics, and the export reuses that classification
+        instead of recomputing it.
+        
+        Args:
+            threshold: Engagement score threshold below which a follower is considered a ghost
+            
+        Returns:
+            PipelineResult with the counts and exported files, or None if the
+            metrics could not be calculated
+        """
+        # Always recompute, so metrics from before the last load_data() are never reused
+        if not self.calculate_engagement_metrics():
+            return None
+        
+        ghost_followers = {}
+        active_followers = {}
+        categorized_ghosts = {'definite_ghosts': {}, 'probable_ghosts': {}, 'possible_ghosts': {}}
+        
+        for username, metrics in self.engagement_metrics.items():
+            if metrics['engagement_score'] < threshold:
+                ghost_followers[username] = metrics
+            else:
+                active_followers[username] = metrics
+            
+            category = ghost_category(metrics)
+            if category:
+                categorized_ghosts[category][username] = metrics
+        
+        definite_count = len(categorized_ghosts['definite_ghosts'])
+        probable_count = len(categorized_ghosts['probable_ghosts'])
+        possible_count = len(categorized_ghosts['possible_ghosts'])
+        
+        logger.info(f"Identified {len(ghost_followers)} ghost followers out of {len(self.engagement_metrics)} total followers")
+        logger.info(f"Categorized ghost followers: {definite_count} definite, {probable_count} probable, {possible_count} possible")
+        
+        export_files = self.export_engagement_data(
+            ghost_followers={'ghost_followers': ghost_followers, 'active_followers': active_followers},
+            categorized_ghosts=categorized_ghosts
+        )
+        
+        return PipelineResult(
+            follower_count=len(self.engagement_metrics),
+            ghost_count=len(ghost_followers),
+            active_count=len(active_followers),
+            definite_count=definite_count,
+            probable_count=probable_count,
+            possible_count=possible_count,
+            export_files=export_files
+        )
+    
     def identify_ghost_followers(self, threshold=0.1):
         """
         Identify ghost followers based on engagement metrics.
@@ -341,21 +452,16 @@ class EngagementDataProcessor:
         definite_ghosts = {}
         probable_ghosts = {}
         possible_ghosts = {}
+        categories = {
+            'definite_ghosts': definite_ghosts,
+            'probable_ghosts': probable_ghosts,
+            'possible_ghosts': possible_ghosts
+        }
         
         for username, metrics in self.engagement_metrics.items():
-            # Definite ghosts: No engagement at all
-            if metrics['like_count'] == 0 and metrics['comment_count'] == 0 and \
-               metrics['story_view_count'] == 0 and metrics['reel_engagement_count'] == 0 and \
-               metrics['active_now_count'] == 0:
-                definite_ghosts[username] = metrics
-            
-            # Probable ghosts: Very low engagement score
-            elif metrics['engagement_score'] < 0.05:
-                probable_ghosts[username] = metrics
-            
-            # Possible ghosts: Low engagement score
-            elif metrics['engagement_score'] < 0.1:
-                possible_ghosts[username] = metrics
+            category = ghost_category(metrics)
+            if category:
+                categories[category][username] = metrics
         
         logger.info(f"Categorized ghost followers: {len(definite_ghosts)} definite, {len(probable_ghosts)} probable, {len(possible_ghosts)} possible")
         
@@ -365,10 +471,14 @@ class EngagementDataProcessor:
             'possible_ghosts': possible_ghosts
         }
     
-    def export_engagement_data(self):
+    def export_engagement_data(self, ghost_followers=None, categorized_ghosts=None):
         """
         Export engagement metrics and ghost follower data to CSV files.
         
+        Args:
+            ghost_followers: Result of identify_ghost_followers(), computed if not given
+            categorized_ghosts: Result of categorize_ghost_followers(), computed if not given
+            
         Returns:
             Dictionary with file paths
         """
@@ -409,7 +519,8 @@ class EngagementDataProcessor:
             logger.info(f"Engagement metrics exported to {metrics_file}")
             
             # Export ghost followers
-            ghost_followers = self.identify_ghost_followers()
+            if ghost_followers is None:
+                ghost_followers = self.identify_ghost_followers()
             
             ghost_data = []
             for username, metrics in ghost_followers.get('ghost_followers', {}).items():
@@ -425,7 +536,8 @@ class EngagementDataProcessor:
             logger.info(f"Ghost followers exported to {ghost_file}")
             
             # Export categorized ghost followers
-            categorized_ghosts = self.categorize_ghost_followers()
+            if categorized_ghosts is None:
+                categorized_ghosts = self.categorize_ghost_followers()
             
             # Definite ghosts
             definite_data = []
@@ -7,6 +7,9 @@ from src.utils.logger import get_default_logger
 # Get logger
 logger = get_default_logger()
 
+# Account types counted in follower statistics; anything else is "unknown"
+KNOWN_ACCOUNT_TYPES = frozenset({"personal", "business", "creator", "unknown"})
+
 class FollowerDataManager:
     """
     Manages follower data storage, retrieval, and processing.
@@ -254,6 +257,8 @@ class FollowerDataManager:
                 
                 # Account type
                 account_type = follower.get("account_type", "unknown")
+                if account_type not in KNOWN_ACCOUNT_TYPES:
+                    account_type = "unknown"
                 stats["account_types"][account_type] += 1
                 
                 # Privacy status
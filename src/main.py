@@ -244,6 +244,9 @@ def main():
         if not simulation_only:
             login_successful = login_to_instagram(browser, use_encrypted_credentials=True, master_password=master_password)
             
+            # The derived key isn't needed once logged in
+            CredentialManager.clear_key_cache()
+            
             if not login_successful:
                 logger.error("Login failed. Exiting.")
                 return
@@ -39,6 +39,13 @@ REEL_LIKES_BUTTON = "section div span a[href*='liked_by']"
 REEL_COMMENTS_BUTTON = "section div span a[href*='comments']"
 ACTIVE_NOW_INDICATOR = "span[aria-label='Active now']"
 
+# Returns which of the given lowercase strings occur in the page HTML, so only
+# the matches cross the driver wire instead of the whole page source
+PAGE_TEXTS_PRESENT_JS = """
+const html = document.documentElement.outerHTML.toLowerCase();
+return arguments[0].filter(text => html.includes(text));
+"""
+
 class EngagementScraper(ScraperBase):
     """
     Scraper for collecting engagement data from Instagram posts, stories, and reels.
@@ -349,7 +356,7 @@ class EngagementScraper(ScraperBase):
                 self.navigate_to(STORY_URL.format(self.target_username))
             
             # Check if stories exist
-            if "No stories to show" in self.browser.page_source:
+            if self._page_texts_present(["no stories to show"]):
                 logger.info(f"No active stories found for {self.target_username}")
                 return []
             
@@ -835,12 +842,10 @@ class EngagementScraper(ScraperBase):
         ]
         
         try:
-            page_source = self.browser.page_source.lower()
-            
-            for indicator in challenge_indicators:
-                if indicator in page_source:
-                    logger.warning(f"Challenge detected: '{indicator}'")
-                    return True
+            found_indicators = self._page_texts_present(challenge_indicators)
+            if found_indicators:
+                logger.warning(f"Challenge detected: '{found_indicators[0]}'")
+                return True
             
             # Also check for specific elements that indicate challenges
             challenge_elements = [
@@ -871,6 +876,18 @@ class EngagementScraper(ScraperBase):
             logger.error(f"Error checking for challenges: {str(e)}")
             return False
     
+    def _page_texts_present(self, texts):
+        """
+        Find which of the given texts occur in the current page's HTML.
+        
+        Args:
+            texts: List of lowercase strings to look for
+            
+        Returns:
+            List of the texts found, in the order given
+        """
+        return self.browser.execute_script(PAGE_TEXTS_PRESENT_JS, texts) or []
+    
     def _handle_login_challenge(self):
         """
         Handle login challenges that might appear during scraping.
@@ -882,10 +899,13 @@ class EngagementScraper(ScraperBase):
         logger.info("Attempting to handle login challenge")
         
         try:
-            page_source = self.browser.page_source.lower()
+            page_texts = set(self._page_texts_present([
+                "suspicious login attempt", "this was me", "save login info",
+                "save your login info", "turn on notifications"
+            ]))
             
             # Check for suspicious login button
-            if "suspicious login attempt" in page_source or "this was me" in page_source:
+            if "suspicious login attempt" in page_texts or "this was me" in page_texts:
                 suspicious_button = wait_for_element(self.browser, "//button[contains(text(), 'This Was Me')]", by=By.XPATH, timeout=5)
                 
                 if suspicious_button:
@@ -895,7 +915,7 @@ class EngagementScraper(ScraperBase):
                     return True
             
             # Check for "Save Login Info" prompt
-            if "save login info" in page_source or "save your login info" in page_source:
+            if "save login info" in page_texts or "save your login info" in page_texts:
                 save_button = wait_for_element(self.browser, "//button[contains(text(), 'Save Info') or contains(text(), 'Not Now')]", by=By.XPATH, timeout=5)
                 
                 if save_button:
@@ -905,7 +925,7 @@ class EngagementScraper(ScraperBase):
                     return True
             
             # Check for notifications prompt
-            if "turn on notifications" in page_source:
+            if "turn on notifications" in page_texts:
                 notifications_button = wait_for_element(self.browser, "//button[contains(text(), 'Not Now')]", by=By.XPATH, timeout=5)
                 
                 if notifications_button:
@@ -4,6 +4,7 @@ import os
 import re
 import random
 from datetime import datetime
+import numpy as np
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
@@ -32,6 +33,82 @@ PROFILE_FOLLOWING_COUNT = "li:nth-child(3) span"
 ACCOUNT_TYPE_BADGE = "div[style*='flex-direction'] > div > div > div > span"
 PRIVATE_ACCOUNT_INDICATOR = "h2 ~ div span"
 
+# "Load more" button detection
+LOAD_MORE_SELECTORS = [
+    "button[type='button']",
+    "a[role='button']",
+    "div[role='button']",
+    "span[role='button']",
+    "button.sqdOP",  # Instagram-specific class
+    "button._acan",  # Another Instagram class
+    "button._acap",  # Another Instagram class
+    "button._ab8w",  # Another Instagram class
+    "button._ac7v",  # Another Instagram class
+    "a.sqdOP",       # Instagram-specific class for links
+    "div.sqdOP"      # Instagram-specific class for divs
+]
+LOAD_MORE_TEXTS = [
+    "load more",
+    "show more",
+    "see more",
+    "view more",
+    "more",
+    "load",
+    "muat lainnya",  # Indonesian
+    "lihat lainnya",  # Indonesian
+    "tampilkan lainnya",  # Indonesian
+    "lainnya",  # Indonesian
+    "muat lebih banyak"  # Indonesian
+]
+FIND_LOAD_MORE_BUTTON_JS = """
+const selectors = arguments[0];
+const texts = arguments[1];
+const matches = (value) => {
+    const lowered = (value || "").trim().toLowerCase();
+    return lowered && texts.some(t => lowered.includes(t));
+};
+for (const el of document.querySelectorAll(selectors)) {
+    if (el.offsetParent !== null && matches(el.textContent)) return el;
+}
+for (const el of document.querySelectorAll("[aria-label]")) {
+    if (el.offsetParent !== null && matches(el.getAttribute("aria-label"))) return el;
+}
+return null;
+"""
+
+# Private account check run in the browser
+IS_PRIVATE_PAGE_JS = """
+const html = document.documentElement.outerHTML;
+return html.indexOf('"is_private":true') !== -1 || html.indexOf('This Account is Private') !== -1;
+"""
+
+# Visibility of a list of elements, computed in the browser
+VISIBILITY_FLAGS_JS = (
+    "return arguments[0].map(e => !!e && e.getClientRects().length > 0"
+    " && getComputedStyle(e).visibility !== 'hidden');"
+)
+
+# Scroll progress tracking: a MutationObserver flags list growth between polls
+WATCH_LIST_GROWTH_JS = """
+const list = arguments[0];
+if (window.__followerListObserver) window.__followerListObserver.disconnect();
+window.__followerListGrew = false;
+window.__followerListObserver = new MutationObserver(() => { window.__followerListGrew = true; });
+window.__followerListObserver.observe(list, {childList: true, subtree: true});
+return [list.scrollHeight, list.scrollTop];
+"""
+READ_LIST_GROWTH_JS = """
+const list = arguments[0];
+const grew = !!window.__followerListGrew;
+window.__followerListGrew = false;
+return [grew, list.scrollHeight, list.scrollTop];
+"""
+
+# Follower categorization
+BOT_USERNAME_PATTERN = re.compile(r"bot|follow|gram|like")
+SPAM_USERNAME_PATTERN = re.compile(r"^(?=[^\W_]*\d)[^\W_]{10,}$")  # 10+ alphanumerics with a digit
+ACCOUNT_TYPE_CATEGORIES = {"business": "business_accounts", "creator": "creator_accounts"}
+
 class FollowerScraper(ScraperBase):
     """
     Scraper for collecting follower data from Instagram.
@@ -51,6 +128,7 @@ class FollowerScraper(ScraperBase):
         self.user_id = None
         self.data_dir = os.path.join("data", "followers")
         self.skip_profile_analysis = False  # Default to analyzing profiles
+        self._profile_meta_cache = {}  # Per-URL cache of account type / privacy lookups
         os.makedirs(self.data_dir, exist_ok=True)
     
     def run(self):
@@ -570,9 +648,8 @@ class FollowerScraper(ScraperBase):
             max_scrolls = 10000  # Increased from 1000 to ensure we get all followers even for large accounts
             last_progress_log = 0
             
-            # Initialize scroll tracking variables
-            previous_height = self.browser.execute_script("return arguments[0].scrollHeight", follower_list)
-            previous_position = self.browser.execute_script("return arguments[0].scrollTop", follower_list)
+            # Initialize scroll tracking variables and start watching the list for new items
+            previous_height, previous_position = self.browser.execute_script(WATCH_LIST_GROWTH_JS, follower_list)
             no_progress_count = 0
             
             # Save the initial timestamp to implement a timeout
@@ -1556,6 +1633,19 @@ class FollowerScraper(ScraperBase):
             logger.debug(f"Error extracting profile statistics: {str(e)}")
             return stats
     
+    def _get_cached_profile_meta(self, key):
+        """
+        Look up a cached profile attribute for the current page URL.
+        
+        Args:
+            key: The attribute name (e.g. "account_type")
+            
+        Returns:
+            Tuple of (url, cached value or None)
+        """
+        url = self.browser.current_url
+        return url, self._profile_meta_cache.get(url, {}).get(key)
+    
     def _determine_account_type_ui(self):
         """
         Determine account type using UI scraping.
@@ -1563,6 +1653,17 @@ class FollowerScraper(ScraperBase):
         Returns:
             String account type: "personal", "business", "creator", or "unknown"
         """
+        url, cached = self._get_cached_profile_meta("account_type")
+        if cached is not None:
+            return cached
+        
+        account_type = self._lookup_account_type_ui()
+        if account_type != "unknown":
+            self._profile_meta_cache.setdefault(url, {})["account_type"] = account_type
+        return account_type
+    
+    def _lookup_account_type_ui(self):
+        """Read the account type badge from the current profile page."""
         try:
             # Check for business/creator badge
             badges = self.browser.find_elements(By.CSS_SELECTOR, ACCOUNT_TYPE_BADGE)
@@ -1589,6 +1690,17 @@ class FollowerScraper(ScraperBase):
         Returns:
             Boolean indicating if the account is private
         """
+        url, cached = self._get_cached_profile_meta("is_private")
+        if cached is not None:
+            return cached
+        
+        is_private = self._lookup_account_private_ui()
+        if is_private is not None:
+            self._profile_meta_cache.setdefault(url, {})["is_private"] = is_private
+        return bool(is_private)
+    
+    def _lookup_account_private_ui(self):
+        """Read the private account indicators from the current profile page, None on error."""
         try:
             # Look for private account indicator
             private_indicators = self.browser.find_elements(By.CSS_SELECTOR, PRIVATE_ACCOUNT_INDICATOR)
@@ -1597,16 +1709,13 @@ class FollowerScraper(ScraperBase):
                 if "private" in indicator.text.lower():
                     return True
             
-            # Also check the page source for private account indicators
-            page_source = self.browser.page_source
-            if '"is_private":true' in page_source or 'This Account is Private' in page_source:
-                return True
-            
-            return False
+            # Also check the page source for private account indicators, inside the
+            # browser so only a boolean is transferred instead of the full HTML
+            return bool(self.browser.execute_script(IS_PRIVATE_PAGE_JS))
             
         except Exception as e:
             logger.debug(f"Error checking if account is private: {str(e)}")
-            return False
+            return None
     
     def save_follower_data(self):
         """Save the collected follower data to a JSON file."""
@@ -1614,16 +1723,15 @@ class FollowerScraper(ScraperBase):
             logger.warning("No follower data to save")
             return
         
-        # Create filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.target_username}_followers_{timestamp}.json"
-        filepath = os.path.join(self.data_dir, filename)
+        # Create filename with timestamp, shared with the categorized file
+        now = datetime.now()
+        timestamp, filepath = self._timestamped_path("followers", now)
         
         # Save to JSON file
         with open(filepath, "w") as f:
             json.dump({
                 "target_username": self.target_username,
-                "collection_timestamp": datetime.now().isoformat(),
+                "collection_timestamp": now.isoformat(),
                 "total_followers_collected": len(self.followers_data),
                 "followers": self.followers_data
             }, f, indent=2)
@@ -1631,78 +1739,79 @@ class FollowerScraper(ScraperBase):
         logger.info(f"Follower data saved to {filepath}")
         
         # Also save a categorized version
-        self.categorize_and_save_followers()
+        self.categorize_and_save_followers(now)
+    
+    def _timestamped_path(self, suffix, now=None):
+        """
+        Build a timestamped output path in the data directory.
+        
+        Args:
+            suffix: File name part after the target username (e.g. "followers")
+            now: Datetime to stamp the file with. Defaults to the current time.
+            
+        Returns:
+            Tuple of (timestamp string, file path)
+        """
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        return timestamp, os.path.join(self.data_dir, f"{self.target_username}_{suffix}_{timestamp}.json")
     
-    def categorize_and_save_followers(self):
+    def categorize_and_save_followers(self, now=None):
         """
         Categorize followers based on preliminary metrics and save to a separate file.
+        
+        Args:
+            now: Datetime of the matching follower data file, so both files share a timestamp
         """
         if not self.followers_data:
             return
         
-        # Initialize categories
+        # Build columnar arrays once so each category is a single vectorized mask
+        analyzed = [f for f in self.followers_data if f.get("detailed_profile_analyzed", False)]
+        usernames = np.array([f["username"] for f in analyzed], dtype=object)
+        counts = np.array(
+            [(f.get("followers_count", 0), f.get("following_count", 0), f.get("posts_count", 0)) for f in analyzed],
+            dtype=np.int64
+        ).reshape(-1, 3)
+        is_private = np.array([f.get("is_private", False) for f in analyzed], dtype=bool)
+        account_types = np.array([f.get("account_type", "unknown") for f in analyzed], dtype=object)
+        
+        followers_counts = counts[:, 0]
+        following_counts = counts[:, 1]
+        posts_counts = counts[:, 2]
+        
+        # Check for potential bots based on username patterns
+        bot_mask = np.array([
+            bool(BOT_USERNAME_PATTERN.search(username) or SPAM_USERNAME_PATTERN.match(username))
+            for username in (u.lower() for u in usernames)
+        ], dtype=bool)
+        
+        # Identify potential low engagement accounts
+        low_engagement_mask = (
+            (following_counts > 1000) &
+            ((followers_counts < 100) | (following_counts / np.maximum(followers_counts, 1) > 10)) &
+            (posts_counts < 10)
+        )
+        
         categories = {
-            "potential_bots": [],
-            "business_accounts": [],
-            "creator_accounts": [],
-            "private_accounts": [],
-            "public_personal_accounts": [],
-            "high_follower_accounts": [],
-            "low_engagement_potential": []
+            "potential_bots": usernames[bot_mask].tolist(),
+            **{
+                category: usernames[account_types == account_type].tolist()
+                for account_type, category in ACCOUNT_TYPE_CATEGORIES.items()
+            },
+            "private_accounts": usernames[is_private].tolist(),
+            "public_personal_accounts": usernames[~is_private & (account_types == "personal")].tolist(),
+            "high_follower_accounts": usernames[followers_counts > 10000].tolist(),
+            "low_engagement_potential": usernames[low_engagement_mask].tolist()
         }
         
-        # Categorize followers
-        for follower in self.followers_data:
-            # Skip followers without detailed analysis
-            if not follower.get("detailed_profile_analyzed", False):
-                continue
-            
-            # Check for potential bots based on username patterns
-            username = follower["username"].lower()
-            if (
-                any(pattern in username for pattern in ["bot", "follow", "gram", "like"]) or
-                (username.isalnum() and len(username) >= 10 and any(c.isdigit() for c in username))
-            ):
-                categories["potential_bots"].append(follower["username"])
-            
-            # Categorize by account type
-            account_type = follower.get("account_type", "unknown")
-            if account_type == "business":
-                categories["business_accounts"].append(follower["username"])
-            elif account_type == "creator":
-                categories["creator_accounts"].append(follower["username"])
-            
-            # Categorize by privacy status
-            if follower.get("is_private", False):
-                categories["private_accounts"].append(follower["username"])
-            elif account_type == "personal":
-                categories["public_personal_accounts"].append(follower["username"])
-            
-            # Categorize by follower count
-            if follower.get("followers_count", 0) > 10000:
-                categories["high_follower_accounts"].append(follower["username"])
-            
-            # Identify potential low engagement accounts
-            following_count = follower.get("following_count", 0)
-            followers_count = follower.get("followers_count", 0)
-            posts_count = follower.get("posts_count", 0)
-            
-            if (
-                following_count > 1000 and 
-                (followers_count < 100 or (following_count / max(followers_count, 1)) > 10) and
-                posts_count < 10
-            ):
-                categories["low_engagement_potential"].append(follower["username"])
-        
         # Save categorized data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.target_username}_follower_categories_{timestamp}.json"
-        filepath = os.path.join(self.data_dir, filename)
+        now = now or datetime.now()
+        timestamp, filepath = self._timestamped_path("follower_categories", now)
         
         with open(filepath, "w") as f:
             json.dump({
                 "target_username": self.target_username,
-                "categorization_timestamp": datetime.now().isoformat(),
+                "categorization_timestamp": now.isoformat(),
                 "categories": categories
             }, f, indent=2)
         
@@ -1721,12 +1830,13 @@ class FollowerScraper(ScraperBase):
             tuple: (is_making_progress, current_height, current_position)
         """
         try:
-            # Get current scroll height and position
-            current_height = self.browser.execute_script("return arguments[0].scrollHeight", follower_list)
-            current_position = self.browser.execute_script("return arguments[0].scrollTop", follower_list)
+            # Read and reset the growth flag together with the scroll metrics in one call
+            grew, current_height, current_position = self.browser.execute_script(
+                READ_LIST_GROWTH_JS, follower_list
+            )
             
-            # Check if height has increased (new content loaded)
-            height_increased = current_height > previous_height
+            # Check if new content loaded (observed DOM growth or a taller container)
+            height_increased = bool(grew) or current_height > previous_height
             
             # Check if position has changed (scrolling occurred)
             position_changed = abs(current_position - previous_position) > 10
@@ -1809,14 +1919,12 @@ class FollowerScraper(ScraperBase):
                 "div[role='dialog'] circle, div[role='dialog'] svg[aria-label='Loading...'], div.W1Bne, " + 
                 "svg[aria-label='Loading'], div.By4nA, circle[role='progressbar']")
             
-            if spinners:
-                for spinner in spinners:
-                    try:
-                        if not spinner.is_displayed():
-                            logger.info("Found hidden loading spinner, indicating end of list")
-                            return True
-                    except:
-                        pass
+            # Unknown visibility (the check failed, e.g. on a stale spinner) is
+            # not treated as a hidden spinner
+            spinner_flags = self._get_visibility_flags(spinners)
+            if spinner_flags and not all(spinner_flags):
+                logger.info("Found hidden loading spinner, indicating end of list")
+                return True
             
             # 2. Check for "Suggested" section that appears at the end of follower lists
             suggested_headers = self.browser.find_elements(By.XPATH, 
@@ -1824,14 +1932,10 @@ class FollowerScraper(ScraperBase):
                 "contains(text(), 'Saran') or contains(text(), 'Recommended') or " +
                 "contains(text(), 'People you might know') or contains(text(), 'Orang yang mungkin Anda kenal')]")
             
-            if suggested_headers:
-                for header in suggested_headers:
-                    try:
-                        if header.is_displayed():
-                            logger.info(f"Found '{header.text}' section, indicating end of list")
-                            return True
-                    except:
-                        pass
+            header = self._first_visible_element(suggested_headers)
+            if header is not None:
+                logger.info(f"Found '{header.text}' section, indicating end of list")
+                return True
             
             # 3. Check for "See All Suggestions" button at the end
             see_all_buttons = self.browser.find_elements(By.XPATH, 
@@ -1839,14 +1943,10 @@ class FollowerScraper(ScraperBase):
                 "contains(text(), 'View All') or contains(text(), 'Show All') or " +
                 "contains(text(), 'See More') or contains(text(), 'Lihat Lainnya')]")
             
-            if see_all_buttons:
-                for button in see_all_buttons:
-                    try:
-                        if button.is_displayed():
-                            logger.info(f"Found '{button.text}' button, indicating end of list")
-                            return True
-                    except:
-                        pass
+            button = self._first_visible_element(see_all_buttons)
+            if button is not None:
+                logger.info(f"Found '{button.text}' button, indicating end of list")
+                return True
             
             # 4. Check if we've reached the bottom of the scrollable container
             try:
@@ -1908,14 +2008,10 @@ class FollowerScraper(ScraperBase):
                 "contains(text(), 'Akhir dari') or contains(text(), 'Tidak ada lagi') or " +
                 "contains(text(), 'No additional') or contains(text(), 'That\'s all')]")
             
-            if end_messages:
-                for message in end_messages:
-                    try:
-                        if message.is_displayed():
-                            logger.info(f"Found end message: '{message.text}', indicating end of list")
-                            return True
-                    except:
-                        pass
+            message = self._first_visible_element(end_messages)
+            if message is not None:
+                logger.info(f"Found end message: '{message.text}', indicating end of list")
+                return True
             
             # 6. Check for empty space at the bottom of the list
             try:
@@ -1965,13 +2061,9 @@ class FollowerScraper(ScraperBase):
                 follower_count_elements = self.browser.find_elements(By.XPATH, 
                     "//*[contains(text(), 'follower') or contains(text(), 'pengikut')]")
                 
-                for element in follower_count_elements:
-                    try:
-                        if element.is_displayed():
-                            follower_count_text = element.text
-                            break
-                    except:
-                        continue
+                count_element = self._first_visible_element(follower_count_elements)
+                if count_element is not None:
+                    follower_count_text = count_element.text
                 
                 if follower_count_text:
                     # Extract the number from text like "1,234 followers" or "1.2K followers"
@@ -2021,6 +2113,45 @@ class FollowerScraper(ScraperBase):
             logger.warning(f"Error checking for end of follower list: {str(e)}")
             return False
     
+    def _get_visibility_flags(self, elements):
+        """
+        Check visibility of several elements in a single browser round-trip.
+        
+        Args:
+            elements: List of WebElements
+            
+        Returns:
+            List of booleans, one per element, or None if the check failed
+            (e.g. an element went stale) and visibility is unknown
+        """
+        if not elements:
+            return []
+        
+        try:
+            return self.browser.execute_script(VISIBILITY_FLAGS_JS, elements)
+        except Exception as e:
+            logger.debug(f"Error checking element visibility: {str(e)}")
+            return None
+    
+    def _first_visible_element(self, elements):
+        """
+        Return the first visible element from a list, or None.
+        
+        Args:
+            elements: List of WebElements
+            
+        Returns:
+            The first visible WebElement, or None if none are visible or
+            visibility could not be checked
+        """
+        flags = self._get_visibility_flags(elements)
+        if flags is None:
+            return None
+        for element, visible in zip(elements, flags):
+            if visible:
+                return element
+        return None
+    
     def _try_click_load_more_button(self, follower_list):
         """
         Try to find and click a "Load More" or "Show More" button if it exists.
@@ -2032,78 +2163,31 @@ class FollowerScraper(ScraperBase):
             bool: True if a button was found and clicked, False otherwise
         """
         try:
-            # Look for various "load more" button patterns
-            load_more_selectors = [
-                "button[type='button']",
-                "a[role='button']",
-                "div[role='button']",
-                "span[role='button']",
-                "button.sqdOP",  # Instagram-specific class
-                "button._acan",  # Another Instagram class
-                "button._acap",  # Another Instagram class
-                "button._ab8w",  # Another Instagram class
-                "button._ac7v",  # Another Instagram class
-                "a.sqdOP",       # Instagram-specific class for links
-                "div.sqdOP"      # Instagram-specific class for divs
-            ]
-            
-            load_more_texts = [
-                "Load more",
-                "Show more",
-                "See more",
-                "View more",
-                "More",
-                "Load",
-                "Muat lainnya",  # Indonesian
-                "Lihat lainnya",  # Indonesian
-                "Tampilkan lainnya",  # Indonesian
-                "Lainnya",  # Indonesian
-                "Muat lebih banyak"  # Indonesian
-            ]
-            
-            # First try to find buttons with specific text
-            for selector in load_more_selectors:
-                elements = self.browser.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    try:
-                        text = element.text.strip().lower()
-                        if any(load_text.lower() in text for load_text in load_more_texts):
-                            logger.info(f"Found load more button with text: {text}")
-                            element.click()
-                            self.human_behavior.random_sleep(1, 2)
-                            return True
-                    except:
-                        continue
-            
-            # Try to find buttons by their aria-label
-            aria_label_buttons = self.browser.find_elements(By.CSS_SELECTOR, "[aria-label]")
-            for button in aria_label_buttons:
-                try:
-                    aria_label = button.get_attribute("aria-label").lower()
-                    if any(load_text.lower() in aria_label for load_text in load_more_texts):
-                        logger.info(f"Found load more button with aria-label: {aria_label}")
-                        button.click()
-                        self.human_behavior.random_sleep(1, 2)
-                        return True
-                except:
-                    continue
+            # Find the first visible button-like element whose text or aria-label matches,
+            # filtering inside the browser so only the match crosses the wire
+            button = self.browser.execute_script(
+                FIND_LOAD_MORE_BUTTON_JS, ",".join(LOAD_MORE_SELECTORS), LOAD_MORE_TEXTS
+            )
+            if button:
+                logger.info("Found load more button")
+                button.click()
+                self.human_behavior.random_sleep(1, 2)
+                return True
             
             # Try to find any element at the bottom of the list that might be clickable
             try:
                 # Get all elements in the follower list
                 all_elements = follower_list.find_elements(By.XPATH, ".//*")
                 
-                # Filter to only visible elements near the bottom
-                visible_elements = []
-                for element in all_elements:
-                    try:
-                        if element.is_displayed():
-                            # Get the element's position
-                            location = element.location
-                            if location and 'y' in location:
-                                visible_elements.append((element, location['y']))
-                    except:
-                        continue
+                # Filter to only visible elements, reading visibility and position in one call
+                positions = self.browser.execute_script(
+                    "return arguments[0].map(e => (e.getClientRects().length > 0 &&"
+                    " getComputedStyle(e).visibility !== 'hidden') ? e.getBoundingClientRect().top + window.scrollY : null);",
+                    all_elements
+                ) if all_elements else []
+                visible_elements = [
+                    (element, y) for element, y in zip(all_elements, positions) if y is not None
+                ]
                 
                 # Sort by vertical position (y coordinate)
                 visible_elements.sort(key=lambda x: x[1], reverse=True)
@@ -1,12 +1,19 @@
 import time
 import os
-import pickle
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.webdriver.support import expected_conditions as EC
 
-from src.config.config import INSTAGRAM_2FA_ENABLED
-from src.utils.browser import wait_for_element, random_sleep, element_exists
+from src.config.config import INSTAGRAM_2FA_ENABLED, REALISTIC_TYPING, COOKIES_DIR
+from src.utils.browser import (
+    random_sleep, wait_for_condition, wait_for_page_load, set_cookies,
+    block_resources, unblock_resources, login_state_cache, invalidate_login_state
+)
 from src.utils.logger import get_default_logger
 from src.utils.credential_manager import CredentialManager
 
@@ -21,6 +28,7 @@ LOGIN_URL = "https://www.instagram.com/accounts/login/"
 USERNAME_INPUT = "input[name='username']"
 PASSWORD_INPUT = "input[name='password']"
 LOGIN_BUTTON = "button[type='submit']"
+PROFILE_ICON = "span[role='link']"
 SAVE_INFO_BUTTON = "//button[contains(text(), 'Save Info') or contains(text(), 'Not Now')]"
 NOTIFICATIONS_BUTTON = "//button[contains(text(), 'Not Now')]"
 TWO_FACTOR_INPUT = "input[name='verificationCode']"
@@ -32,31 +40,236 @@ TWO_FACTOR_CONFIRM_BUTTON = "//button[contains(text(), 'Confirm')]"
 TWO_FACTOR_HEADER = "//h2[contains(text(), 'Enter Confirmation Code')]"
 TWO_FACTOR_RESEND_BUTTON = "//button[contains(text(), 'Resend Code')]"
 
+# Locators (By, selector) built once for WebDriver waits
+USERNAME_INPUT_LOCATOR = (By.CSS_SELECTOR, USERNAME_INPUT)
+PASSWORD_INPUT_LOCATOR = (By.CSS_SELECTOR, PASSWORD_INPUT)
+LOGIN_BUTTON_LOCATOR = (By.CSS_SELECTOR, LOGIN_BUTTON)
+SAVE_INFO_LOCATOR = (By.XPATH, SAVE_INFO_BUTTON)
+NOTIFICATIONS_LOCATOR = (By.XPATH, NOTIFICATIONS_BUTTON)
+TWO_FACTOR_INPUT_LOCATOR = (By.CSS_SELECTOR, TWO_FACTOR_INPUT)
+TWO_FACTOR_BUTTON_LOCATOR = (By.CSS_SELECTOR, TWO_FACTOR_BUTTON)
+SUSPICIOUS_LOGIN_LOCATOR = (By.XPATH, SUSPICIOUS_LOGIN_BUTTON)
+TWO_FACTOR_CODE_INPUT_LOCATOR = (By.CSS_SELECTOR, TWO_FACTOR_CODE_INPUT)
+TWO_FACTOR_CONFIRM_LOCATOR = (By.XPATH, TWO_FACTOR_CONFIRM_BUTTON)
+TWO_FACTOR_HEADER_LOCATOR = (By.XPATH, TWO_FACTOR_HEADER)
+TWO_FACTOR_RESEND_LOCATOR = (By.XPATH, TWO_FACTOR_RESEND_BUTTON)
+
+# Checks XPath (arguments[0]) and CSS (arguments[1]) selector maps in one pass
+TWO_FACTOR_STATE_JS = """
+const state = {};
+for (const [name, xpath] of Object.entries(arguments[0])) {
+    state[name] = !!document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+for (const [name, css] of Object.entries(arguments[1])) {
+    state[name] = !!document.querySelector(css);
+}
+return state;
+"""
+
+# Post-login prompts in detection priority order: (handler name, locator)
+POST_LOGIN_PROMPTS = [
+    ("two_factor", TWO_FACTOR_INPUT_LOCATOR),
+    ("two_factor", TWO_FACTOR_CODE_INPUT_LOCATOR),
+    ("two_factor", TWO_FACTOR_HEADER_LOCATOR),
+    ("suspicious_login", SUSPICIOUS_LOGIN_LOCATOR),
+    ("save_login_info", SAVE_INFO_LOCATOR),
+    ("notifications", NOTIFICATIONS_LOCATOR)
+]
+
+# Clicks the first button found from a {name: xpath} map and returns its name
+CLICK_PROMPT_BUTTON_JS = """
+for (const [name, xpath] of Object.entries(arguments[0])) {
+    const button = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (button) {
+        button.click();
+        return name;
+    }
+}
+return null;
+"""
+
+# Sets an input's value through the native setter (so React sees it) and fires events
+FILL_INPUT_JS = """
+const input = arguments[0];
+const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+setter.call(input, arguments[1]);
+input.dispatchEvent(new Event("input", {bubbles: true}));
+input.dispatchEvent(new Event("change", {bubbles: true}));
+"""
+
+# Prompt waits: normal timeout, and the shortened timeout used once a prompt
+# has been missing PROMPT_MISS_THRESHOLD times in a row
+PROMPT_TIMEOUT = 5
+PROMPT_FAST_TIMEOUT = 0.5
+PROMPT_MISS_THRESHOLD = 10
+
+# Consecutive misses per prompt selector
+_prompt_miss_counts = defaultdict(int)
+
+# Poll interval for login step waits (seconds)
+LOGIN_POLL_FREQUENCY = 0.1
+
+# Maximum number of 2FA codes to try (including resends)
+TWO_FACTOR_MAX_ATTEMPTS = 3
+
+# Instagram session cookie and the minimum remaining lifetime (seconds) to reuse it
+SESSION_COOKIE_NAME = "sessionid"
+SESSION_EXPIRY_MARGIN = 60
+
+# How long a positive login check stays valid (seconds)
+LOGIN_STATE_TTL = 60
+
+
+# Instagram pages where the logged-in navigation isn't shown
+LOGIN_STATE_NAVIGATE_PATHS = ("/accounts/", "/challenge/")
+
+@lru_cache(maxsize=32)
+def cookie_path(username, extension="json"):
+    """
+    Get the path of a user's saved cookies file.
+    
+    Args:
+        username: Instagram username the cookies belong to
+        extension: File extension ("json", or "pkl" for legacy files)
+        
+    Returns:
+        Path to the cookies file
+    """
+    return os.path.join(COOKIES_DIR, f"{username}_cookies.{extension}")
+
+def write_cookie_file(cookies_file, cookies):
+    """
+    Atomically write cookies to a cookies file.
+    
+    The cookies' age is the file's modification time (see
+    mark_cookies_validated), so only the list of cookies is stored.
+    
+    Args:
+        cookies_file: Path of the cookies file
+        cookies: List of cookie dictionaries as returned by browser.get_cookies()
+    """
+    # Per-writer temp name so concurrent saves don't clobber each other's temp file
+    temp_file = f"{cookies_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump(cookies, f)
+    os.replace(temp_file, cookies_file)
+
+def read_cookie_file(cookies_file):
+    """
+    Read a cookies file written by write_cookie_file.
+    
+    Files that bundled the cookies with an "updated" timestamp are still
+    accepted; the timestamp is ignored in favour of the file's mtime.
+    
+    Args:
+        cookies_file: Path of the cookies file
+        
+    Returns:
+        List of cookie dictionaries
+    """
+    with open(cookies_file, "r") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data.get("cookies", [])
+    return data
+
+def mark_cookies_validated(cookies_file):
+    """
+    Record that the cookies in a cookies file were just checked and still work.
+    
+    Only the file's modification time is touched, so the cookies are not
+    rewritten; freshness checks read st_mtime instead of parsing the file.
+    
+    Args:
+        cookies_file: Path of the cookies file
+    """
+    os.utime(cookies_file, None)
+
 def save_cookies(browser, username):
     """Save browser cookies to a file."""
-    cookies_dir = "cookies"
-    os.makedirs(cookies_dir, exist_ok=True)
-    
-    cookies_file = os.path.join(cookies_dir, f"{username}_cookies.pkl")
-    pickle.dump(browser.get_cookies(), open(cookies_file, "wb"))
+    cookies_file = cookie_path(username)
+    write_cookie_file(cookies_file, browser.get_cookies())
     logger.info(f"Cookies saved to {cookies_file}")
 
+def migrate_legacy_cookies(username):
+    """
+    Convert a legacy pickled cookie file to JSON, once.
+    
+    Args:
+        username: Instagram username the cookies belong to
+        
+    Returns:
+        True if a legacy file was migrated, False otherwise
+    """
+    legacy_file = cookie_path(username, "pkl")
+    if not os.path.exists(legacy_file):
+        return False
+    
+    # Only imported for the one-time migration
+    import pickle
+    
+    try:
+        with open(legacy_file, "rb") as f:
+            cookies = pickle.load(f)
+        write_cookie_file(cookie_path(username), cookies)
+        # Keep the original save time, which freshness checks read from st_mtime
+        legacy_mtime = os.path.getmtime(legacy_file)
+        os.utime(cookie_path(username), (legacy_mtime, legacy_mtime))
+        os.remove(legacy_file)
+        logger.info(f"Migrated legacy cookies file {legacy_file} to JSON")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not migrate legacy cookies file {legacy_file}: {str(e)}")
+        return False
+
 def load_cookies(browser, username):
     """Load cookies from file into browser."""
-    cookies_file = os.path.join("cookies", f"{username}_cookies.pkl")
+    cookies_file = cookie_path(username)
     
-    if not os.path.exists(cookies_file):
-        logger.info(f"No cookies file found for {username}")
+    try:
+        cookies = read_cookie_file(cookies_file)
+    except FileNotFoundError:
+        if not migrate_legacy_cookies(username):
+            logger.info(f"No cookies file found for {username}")
+            return False
+        cookies = read_cookie_file(cookies_file)
+    
+    # Skip the cookie login entirely if the session cookie is missing or about to expire
+    now = time.time()
+    session_cookie = next((c for c in cookies if c.get("name") == SESSION_COOKIE_NAME), None)
+    if session_cookie is None or session_cookie.get("expiry", float("inf")) < now + SESSION_EXPIRY_MARGIN:
+        logger.info(f"Saved session cookie for {username} is missing or expired")
         return False
     
-    cookies = pickle.load(open(cookies_file, "rb"))
-    for cookie in cookies:
-        browser.add_cookie(cookie)
+    # Drop individually expired cookies, which the browser would reject
+    cookies = [c for c in cookies if c.get("expiry", float("inf")) > now]
+    set_cookies(browser, cookies)
     
     logger.info(f"Cookies loaded from {cookies_file}")
     return True
 
-def handle_two_factor_auth(browser, two_factor_enabled=None):
+def _get_two_factor_state(browser):
+    """
+    Probe all 2FA UI elements in a single browser round-trip.
+    
+    Args:
+        browser: The browser instance
+        
+    Returns:
+        Dictionary of booleans: header, input1, input2, button, confirm, resend
+    """
+    return browser.execute_script(
+        TWO_FACTOR_STATE_JS,
+        {"header": TWO_FACTOR_HEADER, "confirm": TWO_FACTOR_CONFIRM_BUTTON, "resend": TWO_FACTOR_RESEND_BUTTON},
+        {"input1": TWO_FACTOR_INPUT, "input2": TWO_FACTOR_CODE_INPUT, "button": TWO_FACTOR_BUTTON}
+    )
+
+def _two_factor_prompt_present(browser):
+    """Check whether any of the known 2FA UI elements are on the page."""
+    state = _get_two_factor_state(browser)
+    return state["header"] or state["input1"] or state["input2"]
+
+def handle_two_factor_auth(browser, two_factor_enabled=None, code_provider=input):
     """
     Handle two-factor authentication if needed.
     
@@ -66,6 +279,9 @@ def handle_two_factor_auth(browser, two_factor_enabled=None):
     Args:
         browser: The browser instance
         two_factor_enabled: Override for 2FA setting (from credential manager)
+        code_provider: Callable taking a prompt string and returning the verification
+            code. Defaults to interactive input(); pass e.g. a TOTP generator or a
+            queue reader for unattended logins.
         
     Returns:
         True if 2FA handled successfully or not needed, False otherwise
@@ -79,29 +295,32 @@ def handle_two_factor_auth(browser, two_factor_enabled=None):
         logger.info("2FA is disabled in config, skipping 2FA check")
         return True
         
-    try:
-        # Check for different possible 2FA indicators
-        two_factor_header = element_exists(browser, TWO_FACTOR_HEADER, by=By.XPATH)
-        two_factor_input1 = element_exists(browser, TWO_FACTOR_INPUT)
-        two_factor_input2 = element_exists(browser, TWO_FACTOR_CODE_INPUT)
-        
-        if two_factor_header or two_factor_input1 or two_factor_input2:
-            logger.info("Two-factor authentication detected")
+    for attempt in range(1, TWO_FACTOR_MAX_ATTEMPTS + 1):
+        try:
+            # Check for different possible 2FA indicators
+            state = _get_two_factor_state(browser)
             
-            # Take a screenshot to help the user see what's happening
+            if not (state["header"] or state["input1"] or state["input2"]):
+                # No 2FA prompt on the page
+                return True
+            
+            logger.info(f"Two-factor authentication detected (attempt {attempt}/{TWO_FACTOR_MAX_ATTEMPTS})")
+            
+            # Take a screenshot to help the user see what's happening; it is written
+            # in the background while the user reads the prompt
             screenshot_path = os.path.join("logs", "2fa_screen.png")
-            browser.save_screenshot(screenshot_path)
-            logger.info(f"2FA screen screenshot saved to {screenshot_path}")
+            threading.Thread(target=browser.save_screenshot, args=(screenshot_path,), daemon=True).start()
+            logger.info(f"Saving 2FA screen screenshot to {screenshot_path}")
             
             # Ask user for verification code
-            verification_code = input("\n\n*** TWO-FACTOR AUTHENTICATION REQUIRED ***\nEnter the verification code sent to your device: ")
+            verification_code = code_provider("\n\n*** TWO-FACTOR AUTHENTICATION REQUIRED ***\nEnter the verification code sent to your device: ")
             
             # Try different input fields
             input_field = None
-            if two_factor_input1:
-                input_field = wait_for_element(browser, TWO_FACTOR_INPUT)
-            elif two_factor_input2:
-                input_field = wait_for_element(browser, TWO_FACTOR_CODE_INPUT)
+            if state["input1"]:
+                input_field = wait_for_condition(browser, EC.presence_of_element_located(TWO_FACTOR_INPUT_LOCATOR))
+            elif state["input2"]:
+                input_field = wait_for_condition(browser, EC.presence_of_element_located(TWO_FACTOR_CODE_INPUT_LOCATOR))
             
             if not input_field:
                 logger.error("Could not find 2FA input field")
@@ -110,113 +329,308 @@ def handle_two_factor_auth(browser, two_factor_enabled=None):
             # Clear any existing text and enter verification code
             input_field.clear()
             input_field.send_keys(verification_code)
-            random_sleep(1, 2)
+            random_sleep(0.2, 0.6)  # Small keystroke jitter, not a barrier
             
             # Try different confirm buttons
+            state = _get_two_factor_state(browser)
             confirm_button = None
-            if element_exists(browser, TWO_FACTOR_BUTTON):
-                confirm_button = wait_for_element(browser, TWO_FACTOR_BUTTON)
-            elif element_exists(browser, TWO_FACTOR_CONFIRM_BUTTON, by=By.XPATH):
-                confirm_button = wait_for_element(browser, TWO_FACTOR_CONFIRM_BUTTON, by=By.XPATH)
+            if state["button"]:
+                confirm_button = wait_for_condition(browser, EC.element_to_be_clickable(TWO_FACTOR_BUTTON_LOCATOR))
+            elif state["confirm"]:
+                confirm_button = wait_for_condition(browser, EC.element_to_be_clickable(TWO_FACTOR_CONFIRM_LOCATOR))
             
-            if confirm_button:
-                confirm_button.click()
-                logger.info("Submitted 2FA verification code")
-                random_sleep(5, 7)  # Wait longer after 2FA submission
-                
-                # Check if 2FA was successful
-                if element_exists(browser, TWO_FACTOR_HEADER, by=By.XPATH) or element_exists(browser, TWO_FACTOR_INPUT) or element_exists(browser, TWO_FACTOR_CODE_INPUT):
-                    logger.error("2FA verification failed - incorrect code or expired")
-                    
-                    # Check if resend button is available
-                    if element_exists(browser, TWO_FACTOR_RESEND_BUTTON, by=By.XPATH):
-                        resend = input("Would you like to resend the code? (y/n): ").lower()
-                        if resend == 'y':
-                            resend_button = wait_for_element(browser, TWO_FACTOR_RESEND_BUTTON, by=By.XPATH)
-                            if resend_button:
-                                resend_button.click()
-                                logger.info("Requested new 2FA code")
-                                random_sleep(3, 5)
-                                return handle_two_factor_auth(browser, two_factor_enabled)  # Recursive call to try again
-                    
-                    return False
-                
-                return True
-            else:
+            if not confirm_button:
                 logger.error("Could not find 2FA confirmation button")
                 return False
-    except Exception as e:
-        logger.info(f"Error during 2FA handling: {str(e)}")
+            
+            confirm_button.click()
+            logger.info("Submitted 2FA verification code")
+            
+            # Wait until the 2FA form goes away instead of sleeping
+            wait_for_condition(
+                browser, lambda b: not _two_factor_prompt_present(b),
+                timeout=10, poll_frequency=LOGIN_POLL_FREQUENCY
+            )
+            wait_for_page_load(browser, poll_frequency=LOGIN_POLL_FREQUENCY)
+            
+            # Check if 2FA was successful
+            state = _get_two_factor_state(browser)
+            if not (state["header"] or state["input1"] or state["input2"]):
+                return True
+            
+            logger.error("2FA verification failed - incorrect code or expired")
+            
+            # Check if resend button is available
+            if not state["resend"]:
+                return False
+            
+            # Only ask interactively; other providers always get a fresh code
+            if code_provider is input:
+                resend = input("Would you like to resend the code? (y/n): ").lower()
+                if resend != 'y':
+                    return False
+            
+            resend_button = wait_for_condition(browser, EC.element_to_be_clickable(TWO_FACTOR_RESEND_LOCATOR))
+            if not resend_button:
+                return False
+            
+            resend_button.click()
+            logger.info("Requested new 2FA code")
+            wait_for_page_load(browser)
+        except Exception as e:
+            # If we reach here, we couldn't detect or handle 2FA properly
+            logger.info(f"Error during 2FA handling: {str(e)}")
+            return True
     
-    # If we reach here, either there was no 2FA or we couldn't detect it properly
-    return True
+    logger.error(f"2FA verification failed after {TWO_FACTOR_MAX_ATTEMPTS} attempts")
+    return False
+
+def adaptive_timeout(selector, base=PROMPT_TIMEOUT):
+    """
+    Get the wait timeout for a prompt based on how often it was missing.
+    
+    Args:
+        selector: The prompt selector, or its name in POST_LOGIN_PROMPTS
+        base: Timeout to use while the prompt is still being seen
+        
+    Returns:
+        Timeout in seconds
+    """
+    if _prompt_miss_counts[selector] >= PROMPT_MISS_THRESHOLD:
+        return PROMPT_FAST_TIMEOUT
+    return base
+
+def record_prompt_result(selector, seen):
+    """
+    Record whether a prompt appeared, to adapt future wait timeouts.
+    
+    Args:
+        selector: The prompt selector, or its name in POST_LOGIN_PROMPTS
+        seen: True if the prompt was found
+    """
+    if seen:
+        _prompt_miss_counts[selector] = 0
+    else:
+        _prompt_miss_counts[selector] += 1
 
 def handle_suspicious_login(browser):
     """Handle suspicious login detection if needed."""
     try:
         # Check if suspicious login button is present
-        suspicious_button = wait_for_element(browser, SUSPICIOUS_LOGIN_BUTTON, by=By.XPATH, timeout=5)
+        suspicious_button = wait_for_condition(
+            browser, EC.element_to_be_clickable(SUSPICIOUS_LOGIN_LOCATOR),
+            timeout=adaptive_timeout(SUSPICIOUS_LOGIN_BUTTON)
+        )
+        record_prompt_result(SUSPICIOUS_LOGIN_BUTTON, bool(suspicious_button))
         
         if suspicious_button:
             logger.info("Suspicious login detected")
             suspicious_button.click()
-            random_sleep(3, 5)
+            wait_for_condition(browser, EC.staleness_of(suspicious_button), timeout=5)
             return True
     except Exception as e:
         logger.info(f"No suspicious login detected: {str(e)}")
     
     return True
 
-def handle_save_login_info(browser):
-    """Handle 'Save Login Info' prompt if it appears."""
-    try:
-        # Check if save info button is present
-        save_button = wait_for_element(browser, SAVE_INFO_BUTTON, by=By.XPATH, timeout=5)
+def _click_prompt_button(browser, prompts):
+    """
+    Click the first prompt button present on the page, in one browser round-trip.
+    
+    Args:
+        browser: The browser instance
+        prompts: Dictionary mapping prompt names to button XPaths
+        
+    Returns:
+        Name of the prompt whose button was clicked, or None
+    """
+    return browser.execute_script(CLICK_PROMPT_BUTTON_JS, prompts)
+
+def _dismiss_prompt(browser, name, xpath, timeout=PROMPT_TIMEOUT):
+    """
+    Wait for a single prompt and dismiss it.
+    
+    Args:
+        browser: The browser instance
+        name: Prompt name used for logging
+        xpath: XPath of the button that dismisses the prompt
+        timeout: Maximum time to wait for the prompt in seconds, shortened
+            automatically once the prompt has repeatedly not appeared
         
-        if save_button:
-            logger.info("'Save Login Info' prompt detected")
-            save_button.click()
-            random_sleep(2, 4)
+    Returns:
+        True if the prompt appeared and was dismissed, False otherwise
+    """
+    try:
+        clicked = wait_for_condition(
+            browser, lambda b: _click_prompt_button(b, {name: xpath}),
+            timeout=adaptive_timeout(xpath, timeout)
+        )
+        record_prompt_result(xpath, bool(clicked))
+        if clicked:
+            logger.info(f"'{name}' prompt detected and dismissed")
+            wait_for_page_load(browser)
+            return True
     except Exception as e:
-        logger.info(f"No 'Save Login Info' prompt: {str(e)}")
+        logger.info(f"No '{name}' prompt: {str(e)}")
+    
+    return False
+
+def handle_save_login_info(browser):
+    """Handle 'Save Login Info' prompt if it appears."""
+    _dismiss_prompt(browser, "Save Login Info", SAVE_INFO_BUTTON)
 
 def handle_notifications(browser):
     """Handle notifications prompt if it appears."""
-    try:
-        # Check if notifications button is present
-        notifications_button = wait_for_element(browser, NOTIFICATIONS_BUTTON, by=By.XPATH, timeout=5)
+    _dismiss_prompt(browser, "Notifications", NOTIFICATIONS_BUTTON)
+
+def _prompt_present(name, locator):
+    """
+    Build a wait condition that resolves to a prompt's name once it is on the page.
+    
+    Args:
+        name: Prompt handler name
+        locator: (By, selector) tuple identifying the prompt
         
-        if notifications_button:
-            logger.info("Notifications prompt detected")
-            notifications_button.click()
-            random_sleep(2, 4)
-    except Exception as e:
-        logger.info(f"No notifications prompt: {str(e)}")
+    Returns:
+        Callable taking the browser and returning the name or False
+    """
+    return lambda browser: name if browser.find_elements(*locator) else False
+
+def handle_post_login_prompts(browser, two_factor_enabled=None, max_prompts=None, timeout=PROMPT_TIMEOUT, code_provider=input):
+    """
+    Wait for any post-login prompt at once and dispatch it to its handler.
+    
+    Instead of waiting for each prompt in turn, a single wait races all of them
+    and returns as soon as one appears (or the page stays quiet).
+    
+    Args:
+        browser: The browser instance
+        two_factor_enabled: Override for 2FA setting (from credential manager)
+        max_prompts: Maximum number of prompts to handle (default: every kind
+            in POST_LOGIN_PROMPTS)
+        timeout: Maximum time to wait for the next prompt in seconds, shortened
+            once every pending prompt has repeatedly not appeared
+        code_provider: Source of 2FA verification codes (see handle_two_factor_auth)
+        
+    Returns:
+        True if all prompts were handled or none appeared, False if 2FA or
+        suspicious login handling failed
+    """
+    handlers = {
+        "two_factor": lambda: handle_two_factor_auth(browser, two_factor_enabled, code_provider),
+        "suspicious_login": lambda: handle_suspicious_login(browser),
+        "save_login_info": lambda: handle_save_login_info(browser),
+        "notifications": lambda: handle_notifications(browser)
+    }
+    handled = set()
+    if max_prompts is None:
+        max_prompts = len(handlers)
+    
+    for _ in range(max_prompts):
+        pending = [(name, locator) for name, locator in POST_LOGIN_PROMPTS if name not in handled]
+        if not pending:
+            break
+        
+        # Wait as long as the pending prompt most likely to still appear needs
+        pending_names = {name for name, _ in pending}
+        race_timeout = max(adaptive_timeout(name, timeout) for name in pending_names)
+        
+        # The race resolves to the name of the first prompt found
+        name = wait_for_condition(
+            browser,
+            EC.any_of(*[_prompt_present(name, locator) for name, locator in pending]),
+            timeout=race_timeout,
+            poll_frequency=LOGIN_POLL_FREQUENCY
+        )
+        if not name:
+            # None of the pending prompts showed up this time
+            for pending_name in pending_names:
+                record_prompt_result(pending_name, False)
+            break
+        
+        record_prompt_result(name, True)
+        handled.add(name)
+        logger.info(f"Post-login prompt detected: {name}")
+        if handlers[name]() is False:
+            logger.error(f"Handling '{name}' prompt failed")
+            return False
+    
+    return True
 
 def is_logged_in(browser):
     """Check if the user is logged in."""
-    # Navigate to Instagram homepage
-    browser.get(INSTAGRAM_URL)
-    random_sleep(2, 4)
+    # Reuse a recent positive result while the session is still on Instagram
+    session_id = getattr(browser, "session_id", None)
+    checked_at = login_state_cache.get(session_id)
+    current_url = browser.current_url
+    on_instagram = current_url.startswith(INSTAGRAM_URL)
+    if checked_at is not None and time.monotonic() - checked_at < LOGIN_STATE_TTL and on_instagram:
+        return True
+    
+    # Probe the current page when it is a regular Instagram page; account and
+    # challenge pages don't show the navigation, so go to the homepage for those
+    if not on_instagram or any(part in current_url for part in LOGIN_STATE_NAVIGATE_PATHS):
+        browser.get(INSTAGRAM_URL)
+        wait_for_page_load(browser)
     
-    # Check for elements that indicate logged-in state
-    profile_icon = element_exists(browser, "span[role='link']")
-    login_button = element_exists(browser, LOGIN_BUTTON)
+    # Check for elements that indicate logged-in state in one round-trip
+    profile_icon, login_button = browser.execute_script(
+        "return [!!document.querySelector(arguments[0]), !!document.querySelector(arguments[1])];",
+        PROFILE_ICON, LOGIN_BUTTON
+    )
     
-    return profile_icon and not login_button
+    logged_in = profile_icon and not login_button
+    if logged_in:
+        login_state_cache[session_id] = time.monotonic()
+    else:
+        login_state_cache.pop(session_id, None)
+    
+    return logged_in
 
-def login_to_instagram(browser, use_encrypted_credentials=True, master_password=None):
+def _fill_input(browser, element, value):
+    """
+    Enter text into a form field.
+    
+    With REALISTIC_TYPING enabled the text is typed key by key; otherwise the
+    value is set in a single script call and input/change events are fired so
+    the page picks it up.
+    
+    Args:
+        browser: The browser instance
+        element: The input element
+        value: Text to enter
+    """
+    if REALISTIC_TYPING:
+        element.clear()
+        element.send_keys(value)
+    else:
+        browser.execute_script(FILL_INPUT_JS, element, value)
+
+def login_to_instagram(browser, use_encrypted_credentials=True, master_password=None, code_provider=input):
     """
     Log in to Instagram using the provided credentials.
     
+    Images, media, fonts and stylesheets are blocked for the duration of the
+    login, since only the page structure is needed.
+    
     Args:
         browser: The browser instance
         use_encrypted_credentials: Whether to use encrypted credentials
         master_password: Master password for decrypting credentials
+        code_provider: Source of 2FA verification codes (see handle_two_factor_auth)
         
     Returns:
         True if login successful, False otherwise
     """
+    blocked = block_resources(browser)
+    try:
+        return _login(browser, use_encrypted_credentials, master_password, code_provider)
+    finally:
+        if blocked:
+            unblock_resources(browser)
+
+def _login(browser, use_encrypted_credentials, master_password, code_provider):
+    """Run the login flow; see login_to_instagram."""
     # Get credentials
     credential_manager = CredentialManager()
     
@@ -260,63 +674,71 @@ def login_to_instagram(browser, use_encrypted_credentials=True, master_password=
     browser.get(INSTAGRAM_URL)
     if load_cookies(browser, username):
         browser.refresh()
-        random_sleep(3, 5)
+        wait_for_page_load(browser)
         
         if is_logged_in(browser):
             logger.info("Successfully logged in using cookies")
             return True
         else:
             logger.info("Cookie login failed, trying with credentials")
+            invalidate_login_state(browser)
     
     # Navigate to login page
     browser.get(LOGIN_URL)
-    random_sleep(2, 4)
+    wait_for_page_load(browser, poll_frequency=LOGIN_POLL_FREQUENCY)
     
     # Enter username
-    username_input = wait_for_element(browser, USERNAME_INPUT)
+    username_input = wait_for_condition(browser, EC.presence_of_element_located(USERNAME_INPUT_LOCATOR))
     if not username_input:
         logger.error("Could not find username input field")
         return False
     
-    username_input.clear()
-    username_input.send_keys(username)
-    random_sleep(1, 2)
+    _fill_input(browser, username_input, username)
+    random_sleep(0.2, 0.6)  # Small keystroke jitter, not a barrier
     
     # Enter password
-    password_input = wait_for_element(browser, PASSWORD_INPUT)
+    password_input = wait_for_condition(
+        browser, EC.element_to_be_clickable(PASSWORD_INPUT_LOCATOR),
+        timeout=8, poll_frequency=LOGIN_POLL_FREQUENCY
+    )
     if not password_input:
         logger.error("Could not find password input field")
         return False
     
-    password_input.clear()
-    password_input.send_keys(password)
-    random_sleep(1, 2)
+    _fill_input(browser, password_input, password)
+    random_sleep(0.2, 0.6)  # Small keystroke jitter, not a barrier
     
     # Click login button
-    login_button = wait_for_element(browser, LOGIN_BUTTON)
+    login_button = wait_for_condition(
+        browser, EC.element_to_be_clickable(LOGIN_BUTTON_LOCATOR),
+        timeout=8, poll_frequency=LOGIN_POLL_FREQUENCY
+    )
     if not login_button:
         logger.error("Could not find login button")
         return False
     
     login_button.click()
-    random_sleep(5, 7)
     
-    # Handle two-factor authentication if needed
-    if not handle_two_factor_auth(browser, two_factor_enabled):
-        logger.error("Two-factor authentication failed")
-        return False
+    # Wait for the login form to be replaced by the feed or a follow-up prompt
+    wait_for_condition(
+        browser,
+        EC.any_of(
+            lambda b: "/accounts/login" not in b.current_url,
+            EC.presence_of_element_located(TWO_FACTOR_INPUT_LOCATOR),
+            EC.presence_of_element_located(TWO_FACTOR_CODE_INPUT_LOCATOR),
+            EC.presence_of_element_located(SUSPICIOUS_LOGIN_LOCATOR),
+            EC.presence_of_element_located(SAVE_INFO_LOCATOR)
+        ),
+        timeout=10,
+        poll_frequency=LOGIN_POLL_FREQUENCY
+    )
+    wait_for_page_load(browser, poll_frequency=LOGIN_POLL_FREQUENCY)
     
-    # Handle suspicious login if needed
-    if not handle_suspicious_login(browser):
-        logger.error("Suspicious login handling failed")
+    # Handle 2FA, suspicious login, 'Save Login Info' and notifications prompts
+    if not handle_post_login_prompts(browser, two_factor_enabled, code_provider=code_provider):
+        invalidate_login_state(browser)
         return False
     
-    # Handle 'Save Login Info' prompt
-    handle_save_login_info(browser)
-    
-    # Handle notifications prompt
-    handle_notifications(browser)
-    
     # Verify login success
     if is_logged_in(browser):
         logger.info("Successfully logged in to Instagram")
@@ -327,6 +749,7 @@ def login_to_instagram(browser, use_encrypted_credentials=True, master_password=
         return True
     else:
         logger.error("Login failed")
+        invalidate_login_state(browser)
         
         # Take a screenshot of the failed login state
         screenshot_path = os.path.join("logs", "login_failed.png")
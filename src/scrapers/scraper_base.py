@@ -16,6 +16,14 @@ from src.config.config import INSTAGRAM_USERNAME
 # Get logger
 logger = get_default_logger()
 
+# IP ban detection
+BAN_URL_MARKERS = ("/challenge", "/suspended")
+BAN_TEXT_MARKERS = ("unusual traffic", "suspicious")
+BAN_TEXT_SNIPPET_LENGTH = 4096
+BAN_TEXT_SNIPPET_JS = (
+    "return ((document.body && document.body.innerText) || '').slice(0, arguments[0]).toLowerCase();"
+)
+
 class ScraperBase(ABC):
     """
     Base class for all scrapers with common functionality.
@@ -40,8 +48,8 @@ class ScraperBase(ABC):
         if proxy:
             logger.info(f"Using proxy: {proxy}")
         
-        # Start the browser
-        self.browser = self.browser_manager.start_browser()
+        # Start the browser on the account's persistent profile
+        self.browser = self.browser_manager.start_browser(self.username)
         
         # Initialize human behavior simulator
         self.human_behavior = HumanBehaviorSimulator(self.browser)
@@ -106,7 +114,7 @@ class ScraperBase(ABC):
             
         except Exception as e:
             # Check if this might be an IP ban
-            if "unusual traffic" in self.browser.page_source.lower() or "suspicious" in self.browser.page_source.lower():
+            if self._is_ban_page():
                 logger.warning("Possible IP ban detected")
                 self.proxy_manager.mark_proxy_failure(ban=True)
                 
@@ -118,6 +126,29 @@ class ScraperBase(ABC):
                 
             raise ScraperException(f"Navigation failed: {str(e)}")
     
+    def _is_ban_page(self):
+        """
+        Check whether the current page is an IP ban / unusual traffic page.
+        
+        The URL and title are checked first; only if they are inconclusive is the
+        start of the page text read, instead of the full page source.
+        
+        Returns:
+            True if a ban page is shown, False otherwise
+        """
+        try:
+            url = self.browser.current_url
+            title = self.browser.title.lower()
+            if any(path in url for path in BAN_URL_MARKERS) or any(marker in title for marker in BAN_TEXT_MARKERS):
+                return True
+            
+            snippet = self.browser.execute_script(BAN_TEXT_SNIPPET_JS, BAN_TEXT_SNIPPET_LENGTH)
+        except Exception as e:
+            logger.debug(f"Could not read page text for ban check: {str(e)}")
+            return False
+        
+        return any(marker in snippet for marker in BAN_TEXT_MARKERS)
+    
     def wait_and_refresh(self, seconds=60):
         """
         Wait for a specified time and then refresh the page.
@@ -128,10 +159,7 @@ class ScraperBase(ABC):
         """
         logger.info(f"Waiting for {seconds} seconds before refreshing...")
         
-        # Wait with a countdown
-        for remaining in range(seconds, 0, -5):
-            logger.debug(f"Refreshing in {remaining} seconds...")
-            time.sleep(5)
+        time.sleep(seconds)
         
         # Refresh the page
         self.browser.refresh()
@@ -2,7 +2,7 @@ import os
 import sys
 import time
 import json
-from src.utils.browser import setup_browser
+from src.utils.browser import browser_pool
 from src.utils.logger import get_default_logger
 from src.scrapers.login import login_to_instagram
 from src.utils.credential_manager import CredentialManager
@@ -39,8 +39,8 @@ def test_engagement_scraper(target_username=None):
         credential_manager.set_credentials(username, password)
         credential_manager.setup_encryption(master_password)
     
-    # Set up browser
-    browser = setup_browser()
+    # Borrow a browser from the pool, so repeated runs in one process reuse it
+    browser = browser_pool.acquire()
     if not browser:
         logger.error("Failed to set up browser. Exiting.")
         return
@@ -49,6 +49,9 @@ def test_engagement_scraper(target_username=None):
         # Login to Instagram
         login_successful = login_to_instagram(browser, use_encrypted_credentials=True, master_password=master_password)
         
+        # The derived key isn't needed once logged in
+        CredentialManager.clear_key_cache()
+        
         if not login_successful:
             logger.error("Login failed. Exiting.")
             return
@@ -82,29 +85,15 @@ def test_engagement_scraper(target_username=None):
             if processor.load_data():
                 logger.info("Data loaded successfully")
                 
-                # Calculate engagement metrics
-                if processor.calculate_engagement_metrics():
+                # Calculate metrics, classify, categorize and export in one pass
+                result = processor.run_pipeline()
+                if result:
                     logger.info("Engagement metrics calculated successfully")
+                    logger.info(f"Identified {result.ghost_count} ghost followers and {result.active_count} active followers")
+                    logger.info(f"Categorized as: {result.definite_count} definite, {result.probable_count} probable, {result.possible_count} possible")
                     
-                    # Identify ghost followers
-                    ghost_followers = processor.identify_ghost_followers()
-                    ghost_count = len(ghost_followers.get('ghost_followers', {}))
-                    active_count = len(ghost_followers.get('active_followers', {}))
-                    
-                    logger.info(f"Identified {ghost_count} ghost followers and {active_count} active followers")
-                    
-                    # Categorize ghost followers
-                    categorized = processor.categorize_ghost_followers()
-                    definite_count = len(categorized.get('definite_ghosts', {}))
-                    probable_count = len(categorized.get('probable_ghosts', {}))
-                    possible_count = len(categorized.get('possible_ghosts', {}))
-                    
-                    logger.info(f"Categorized as: {definite_count} definite, {probable_count} probable, {possible_count} possible")
-                    
-                    # Export data
-                    export_files = processor.export_engagement_data()
-                    if export_files:
-                        logger.info(f"Data exported to: {', '.join(export_files.values())}")
+                    if result.export_files:
+                        logger.info(f"Data exported to: {', '.join(result.export_files.values())}")
                     else:
                         logger.warning("Data export failed")
                 else:
@@ -117,10 +106,9 @@ def test_engagement_scraper(target_username=None):
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
     finally:
-        # Close the browser
-        if browser:
-            browser.quit()
-            logger.info("Browser closed")
+        # Return the browser to the pool; the pool quits it at interpreter exit
+        browser_pool.release(browser)
+        logger.info("Browser released")
 
 if __name__ == "__main__":
     # Get target username from command line argument if provided
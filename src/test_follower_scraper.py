@@ -1,26 +1,172 @@
 import os
 import sys
-import getpass
-import pickle
 from pathlib import Path
-from src.utils.browser import setup_browser, get_user_agent
+from src.utils.browser import (
+    get_user_agent, set_cookies, block_resources, resize_connection_pool,
+    resource_saving_arguments, BLOCKED_RESOURCE_PATTERNS, BrowserPool, browser_pool
+)
 from src.utils.logger import get_default_logger
-from src.scrapers.login import login_to_instagram
-from src.utils.credential_manager import CredentialManager
+from src.scrapers.login import (
+    INSTAGRAM_URL, login_to_instagram, is_logged_in, cookie_path, migrate_legacy_cookies,
+    read_cookie_file, write_cookie_file
+)
+from src._common import (
+    get_resolved_credentials, forget_credentials, wait_for, dump_debug_json, parse_json,
+    PAGE_BODY, LOGGED_IN_INDICATOR
+)
 from src.scrapers.follower_scraper import FollowerScraper
 from src.data.follower_data import FollowerDataManager
 import re
 import json
-import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 # Get logger
 logger = get_default_logger()
 
+# The user ID test only reads DOM text and embedded JSON, so it also skips
+# audio and everything served from Instagram's media CDN
+DEBUG_BLOCKED_URL_PATTERNS = BLOCKED_RESOURCE_PATTERNS + ("*.m4a", "*scontent*.cdninstagram.com/*")
+
+# Write debug_* dump files only when asked to (SCRAPER_DEBUG=1 or --debug)
+DEBUG_DUMP = os.getenv("SCRAPER_DEBUG") == "1" or "--debug" in sys.argv
+
+# Profile page readiness indicator used instead of a fixed sleep
+PROFILE_HEADER = (By.CSS_SELECTOR, "header section")
+
+# Patterns that locate a user ID in page source; each has exactly one group.
+# Username-specific patterns are formatted per username and cached below.
+USER_ID_PATTERNS = [
+    r'"user_id":"(\d+)"',
+    r'"profilePage_(\d+)"',
+    r'"owner":{"id":"(\d+)"',
+]
+USERNAME_USER_ID_PATTERNS = [
+    r'"id":"(\d+)","username":"{}"',
+    r'instagram://user\?username={}&amp;userid=(\d+)',
+]
+HTML_COMMENT_USER_ID_RE = re.compile(r"<!--.*?user_id[\"']?\s*:\s*[\"']?(\d+)[\"']?.*?-->", re.DOTALL)
+
+# XPath queries run on the page source parsed once with lxml
+JSON_SCRIPTS_XPATH = "//script[@type='application/json' or @type='text/json']"
+META_CONTENTS_XPATH = "//meta/@content"
+
+# Collect script bodies mentioning the username in one call.
+# Scripts come back as [index, innerHTML] pairs so debug dumps keep their index.
+SCRIPTS_CONTAINING_JS = """
+const scripts = Array.from(document.scripts);
+return {
+    total: scripts.length,
+    matches: scripts
+        .map((s, i) => [i, s.innerHTML])
+        .filter(([i, text]) => text && text.includes(arguments[0]))
+};
+"""
+ADDITIONAL_DATA_JS = """
+const result = {};
+for (const key in window) {
+    if (key.startsWith('__additionalData')) {
+        result[key] = window[key];
+    }
+}
+return result;
+"""
+JS_OBJECTS_WITH_USER_ID_JS = """
+const result = {};
+for (const key in window) {
+    try {
+        const value = window[key];
+        if (value && typeof value === 'object') {
+            if (value.user_id || 
+                (value.user && value.user.id) || 
+                (value.data && value.data.user && value.data.user.id)) {
+                result[key] = {
+                    user_id: value.user_id || (value.user && value.user.id) || (value.data && value.data.user && value.data.user.id)
+                };
+            }
+        }
+    } catch (e) {
+        // Ignore errors
+    }
+}
+return result;
+"""
+DATA_USER_IDS_JS = """
+return Array.from(document.querySelectorAll('[data-user-id]'))
+    .map(e => e.getAttribute('data-user-id'));
+"""
+# Read all keys of a Web Storage area plus the values of user/id-related keys
+STORAGE_ENTRIES_JS = """
+const storage = window[arguments[0]];
+const keys = Object.keys(storage);
+const entries = {};
+for (const key of keys) {
+    const lower = key.toLowerCase();
+    if (lower.includes('user') || lower.includes('id')) {
+        entries[key] = storage.getItem(key);
+    }
+}
+return {keys: keys, entries: entries};
+"""
+
+# Worker threads used to run the user ID extraction methods
+USER_ID_METHOD_WORKERS = 4
+
+@lru_cache(maxsize=64)
+def get_user_id_regex(username):
+    """
+    Get a single compiled regex matching any of the user ID patterns.
+    
+    The patterns are joined into one alternation so a text is scanned once
+    instead of once per pattern. Results are cached per username.
+    
+    Args:
+        username: Instagram username the profile-specific patterns refer to
+        
+    Returns:
+        Tuple of (compiled regex, tuple of source patterns in group order)
+    """
+    patterns = tuple(USER_ID_PATTERNS) + tuple(
+        pattern.format(re.escape(username)) for pattern in USERNAME_USER_ID_PATTERNS
+    )
+    regex = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    return regex, patterns
+
+def search_user_id(user_id_regex, text):
+    """
+    Search text for a user ID with a compiled user ID regex.
+    
+    Patterns keep their priority: a match for an earlier pattern wins over a
+    match for a later one, even if the later one appears first in the text
+    (e.g. another user's "owner" blob before the profile's own "user_id").
+    
+    Args:
+        user_id_regex: Tuple returned by get_user_id_regex
+        text: Text to search
+        
+    Returns:
+        Tuple of (user ID, matching pattern), or (None, None) if not found
+    """
+    regex, patterns = user_id_regex
+    best = None
+    # Each pattern has a single group, so the matched group identifies it
+    for match in regex.finditer(text or ""):
+        if best is None or match.lastindex < best.lastindex:
+            best = match
+            if best.lastindex == 1:
+                break
+    if best is None:
+        return None, None
+    return best.group(best.lastindex), patterns[best.lastindex - 1]
+
 def main():
     """Test the follower scraper functionality."""
     logger.info("Testing follower scraper")
@@ -33,75 +179,53 @@ def main():
     else:
         logger.info(f"Using target username: {target_username}")
     
-    # Set up credentials
-    credential_manager = CredentialManager()
-    
-    # Try auto setup first
-    if credential_manager.auto_setup_from_env():
-        logger.info("Using automatically set up credentials from environment")
-        master_password = os.getenv("MASTER_PASSWORD")
-    else:
-        # Check if credentials file exists
-        credentials_file = os.path.join("credentials", "encrypted_credentials.json")
-        
-        if not os.path.exists(credentials_file):
-            logger.error("No credentials file found. Please run main.py first to set up credentials.")
-            return
-        
-        # Get master password
-        master_password = getpass.getpass("Enter master password to decrypt credentials: ")
-        if not credential_manager.setup_encryption(master_password):
-            logger.error("Failed to set up encryption with provided master password")
-            return
-    
-    # Get credentials
-    credentials = credential_manager.get_credentials()
-    if not credentials:
-        logger.error("Failed to retrieve credentials")
+    # Resolve credentials (once per session)
+    username, master_password, _ = get_resolved_credentials()
+    if not username:
         return
     
-    username = credentials["username"]
-    
-    # Create cookies directory if it doesn't exist
-    cookies_dir = Path("cookies")
-    cookies_dir.mkdir(exist_ok=True)
-    
-    cookie_file = cookies_dir / f"{username}_cookies.pkl"
+    # Cookies are stored as JSON; convert a legacy pickled file once if present
+    cookie_file = Path(cookie_path(username))
+    if not cookie_file.exists():
+        migrate_legacy_cookies(username)
     
-    # Set up browser
-    browser = setup_browser()
+    # Set up browser (reused from the pool when one is idle)
+    browser = browser_pool.acquire()
     if not browser:
         logger.error("Failed to set up browser")
         return
     
+    wait = WebDriverWait(browser, 10)
+    
     try:
         # Try to use cookies first if they exist
         if cookie_file.exists():
             logger.info(f"Found existing cookies for {username}")
             
             # First navigate to Instagram
-            browser.get("https://www.instagram.com/")
-            time.sleep(3)
+            browser.get(INSTAGRAM_URL)
+            wait_for(wait, PAGE_BODY)
             
             # Load cookies
             logger.info(f"Loading cookies from {cookie_file}")
-            with open(cookie_file, "rb") as f:
-                cookies = pickle.load(f)
-                for cookie in cookies:
-                    # Handle domain issues that might cause cookie rejection
-                    if "domain" in cookie and cookie["domain"].startswith("."):
-                        cookie["domain"] = cookie["domain"][1:]
-                    try:
-                        browser.add_cookie(cookie)
-                    except Exception as e:
-                        logger.warning(f"Could not add cookie {cookie.get('name')}: {str(e)}")
+            cookies = read_cookie_file(cookie_file)
+            for cookie in cookies:
+                # Handle domain issues that might cause cookie rejection
+                if "domain" in cookie and cookie["domain"].startswith("."):
+                    cookie["domain"] = cookie["domain"][1:]
+            try:
+                # One CDP call for the whole list instead of one add_cookie per cookie
+                set_cookies(browser, cookies)
+            except Exception as e:
+                logger.warning(f"Could not add cookies: {str(e)}")
             
             # Refresh the page to apply cookies
             browser.refresh()
-            time.sleep(5)
+            wait_for(wait, LOGGED_IN_INDICATOR)
             
-            # Check if we're logged in
-            if "not-logged-in" not in browser.page_source and username.lower() in browser.page_source.lower():
+            # Check if we're logged in with a single DOM probe rather than
+            # pulling the whole page source over the wire
+            if is_logged_in(browser):
                 logger.info("Successfully logged in using cookies!")
                 login_successful = True
             else:
@@ -120,8 +244,7 @@ def main():
                 
                 # Save cookies for future use
                 logger.info(f"Saving cookies to {cookie_file}")
-                with open(cookie_file, "wb") as f:
-                    pickle.dump(browser.get_cookies(), f)
+                write_cookie_file(cookie_file, browser.get_cookies())
                 
                 # Verify cookies were saved
                 if cookie_file.exists():
@@ -171,63 +294,414 @@ def main():
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
     finally:
-        # Close the browser
-        if browser:
-            browser.quit()
-            logger.info("Browser closed")
+        # Return the browser to the pool; it is quit at interpreter exit
+        browser_pool.release(browser)
+        logger.info("Browser released")
 
-def test_extract_user_id():
+def create_debug_browser():
     """
-    Test function to extract user ID from Instagram profile page.
-    """
-    # Get username
-    username = input("Enter Instagram username to test (leave blank for your own account): ")
-    if not username:
-        # Try auto setup first
-        credential_manager = CredentialManager()
-        if credential_manager.auto_setup_from_env():
-            logger.info("Using automatically set up credentials from environment")
-            master_password = os.getenv("MASTER_PASSWORD")
-        else:
-            # Manual setup
-            master_password = getpass.getpass("Enter your master password: ")
-            if not credential_manager.setup_encryption(master_password):
-                logger.error("Failed to set up encryption")
-                return
-        
-        # Get credentials
-        credentials = credential_manager.get_credentials()
-        
-        if not credentials:
-            logger.error("Failed to get credentials")
-            return
-        
-        username = credentials.get("username")
-        
-        if not username:
-            logger.error("Username not found in credentials")
-            return
-    
-    # Create cookies directory if it doesn't exist
-    cookies_dir = Path("cookies")
-    cookies_dir.mkdir(exist_ok=True)
-    
-    cookie_file = cookies_dir / f"{username}_cookies.pkl"
+    Create a plain headless Chrome instance for the user ID extraction test.
     
+    Returns:
+        The browser instance
+    """
     # Set up Chrome options
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-notifications")
     chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-infobars")
     chrome_options.add_argument("--mute-audio")
-    chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument(f"--user-agent={get_user_agent()}")
+    chrome_options.add_argument("--headless=new")
+    for argument in resource_saving_arguments(headless=True):
+        chrome_options.add_argument(argument)
+    
+    # Return from get() on DOMContentLoaded; the test waits for elements itself
+    chrome_options.page_load_strategy = "eager"
     
-    # Initialize browser
     browser = webdriver.Chrome(options=chrome_options)
+    resize_connection_pool(browser)
+    block_resources(browser, DEBUG_BLOCKED_URL_PATTERNS)
+    return browser
+
+# Pool of plain Chrome instances for test_extract_user_id
+debug_browser_pool = BrowserPool(create_debug_browser)
+
+@dataclass
+class PageSnapshot:
+    """Browser artifacts captured once so the extraction methods can run off-driver."""
+    username: str
+    page_source: str
+    shared_data: dict = None
+    scripts: dict = None
+    additional_data: dict = None
+    js_objects: dict = None
+    html_tree: object = None
+    data_user_ids: list = None
+    local_storage: dict = None
+    session_storage: dict = None
+    cookies: list = None
+    
+    @property
+    def user_id_regex(self):
+        return get_user_id_regex(self.username)
+
+def _snapshot_value(description, fetch):
+    """
+    Run one WebDriver fetch for a snapshot, logging instead of raising.
+    
+    Args:
+        description: Name of the method the data is for, used in the warning
+        fetch: Callable performing the WebDriver call
+        
+    Returns:
+        The fetched value, or None if the call failed
+    """
+    try:
+        return fetch()
+    except Exception as e:
+        logger.warning(f"{description} failed: {str(e)}")
+        return None
+
+def take_page_snapshot(browser, username, page_source):
+    """
+    Serially collect everything the user ID extraction methods read from the browser.
+    
+    Args:
+        browser: The browser instance, already on the profile page
+        username: Instagram username of the profile
+        page_source: Page source fetched after the page became ready
+        
+    Returns:
+        PageSnapshot with one field per browser artifact
+    """
+    return PageSnapshot(
+        username=username,
+        page_source=page_source,
+        shared_data=_snapshot_value("Method 2", lambda: browser.execute_script("return window._sharedData;")),
+        scripts=_snapshot_value("Method 3", lambda: browser.execute_script(SCRIPTS_CONTAINING_JS, username)),
+        additional_data=_snapshot_value("Method 4", lambda: browser.execute_script(ADDITIONAL_DATA_JS)),
+        js_objects=_snapshot_value("Method 5", lambda: browser.execute_script(JS_OBJECTS_WITH_USER_ID_JS)),
+        html_tree=_snapshot_value("Parsing page source", lambda: lxml_html.fromstring(page_source)),
+        data_user_ids=_snapshot_value("Method 7", lambda: browser.execute_script(DATA_USER_IDS_JS)),
+        local_storage=_snapshot_value("Method 10", lambda: browser.execute_script(STORAGE_ENTRIES_JS, "localStorage")),
+        session_storage=_snapshot_value("Method 11", lambda: browser.execute_script(STORAGE_ENTRIES_JS, "sessionStorage")),
+        cookies=_snapshot_value("Method 12", browser.get_cookies),
+    )
+
+def method_1(snapshot):
+    """Extract the user ID from the page source using regex."""
+    user_id, pattern = search_user_id(snapshot.user_id_regex, snapshot.page_source)
+    if user_id:
+        logger.info(f"Method 1: Found user ID using pattern '{pattern}': {user_id}")
+    return user_id
+
+def method_2(snapshot):
+    """Extract the user ID from window._sharedData."""
+    shared_data = snapshot.shared_data
+    if not shared_data:
+        return None
+    
+    logger.info("Found window._sharedData")
+    
+    # Save for debugging
+    if DEBUG_DUMP:
+        dump_debug_json(shared_data, "debug_shared_data.json")
+        logger.info("Shared data saved to debug_shared_data.json")
+    
+    # Try to extract user ID
+    if (shared_data.get("entry_data") and 
+        shared_data["entry_data"].get("ProfilePage") and 
+        shared_data["entry_data"]["ProfilePage"][0].get("graphql") and 
+        shared_data["entry_data"]["ProfilePage"][0]["graphql"].get("user")):
+        
+        user_id = shared_data["entry_data"]["ProfilePage"][0]["graphql"]["user"].get("id")
+        if user_id:
+            logger.info(f"Method 2: Found user ID from _sharedData: {user_id}")
+            return user_id
+    return None
+
+def method_3(snapshot):
+    """Extract the user ID from script tags mentioning the username."""
+    if not snapshot.scripts:
+        return None
+    
+    logger.info(f"Found {snapshot.scripts['total']} script tags")
+    
+    user_id = None
+    for i, script_content in snapshot.scripts["matches"]:
+        try:
+            logger.info(f"Found script {i} containing username")
+            
+            # Save script content for debugging
+            if DEBUG_DUMP:
+                with open(f"debug_script_{i}.js", "w", encoding="utf-8") as f:
+                    f.write(script_content)
+            
+            # Check for user ID in script content
+            found_id, pattern = search_user_id(snapshot.user_id_regex, script_content)
+            if found_id:
+                user_id = found_id
+                logger.info(f"Method 3: Found user ID in script {i} using pattern '{pattern}': {user_id}")
+        except Exception as e:
+            logger.debug(f"Error processing script {i}: {str(e)}")
+    return user_id
+
+def method_4(snapshot):
+    """Report window.__additionalData* objects, dumping them when debugging."""
+    if snapshot.additional_data:
+        logger.info(f"Found additional data: {list(snapshot.additional_data.keys())}")
+        
+        # Save for debugging
+        if DEBUG_DUMP:
+            dump_debug_json(str(snapshot.additional_data), "debug_additional_data.json")
+            logger.info("Additional data saved to debug_additional_data.json")
+    return None
+
+def method_5(snapshot):
+    """Extract the user ID from any global JavaScript object carrying one."""
+    js_objects = snapshot.js_objects
+    if not js_objects:
+        return None
+    
+    logger.info(f"Found JavaScript objects with user ID: {list(js_objects.keys())}")
+    
+    user_id = None
+    for key, value in js_objects.items():
+        logger.info(f"Object {key} has user ID: {value.get('user_id')}")
+        user_id = user_id or value.get("user_id")
+    
+    # Save for debugging
+    if DEBUG_DUMP:
+        dump_debug_json(str(js_objects), "debug_js_objects.json")
+        logger.info("JavaScript objects saved to debug_js_objects.json")
+    return str(user_id) if user_id else None
+
+def method_6(snapshot):
+    """Extract the user ID from meta tag contents mentioning the username."""
+    if snapshot.html_tree is None:
+        return None
+    
+    contents = snapshot.html_tree.xpath(META_CONTENTS_XPATH)
+    logger.info(f"Found {len(contents)} meta tags")
+    
+    user_id = None
+    for content in contents:
+        if snapshot.username not in content:
+            continue
+        
+        logger.info(f"Found meta tag with content containing username: {content}")
+        
+        # Check for user ID in content
+        found_id, pattern = search_user_id(snapshot.user_id_regex, content)
+        if found_id:
+            user_id = found_id
+            logger.info(f"Method 6: Found user ID in meta tag using pattern '{pattern}': {user_id}")
+    return user_id
+
+def method_7(snapshot):
+    """Extract the user ID from data-user-id attributes."""
+    for user_id in snapshot.data_user_ids or []:
+        if user_id:
+            logger.info(f"Method 7: Found user ID in data-user-id attribute: {user_id}")
+            return user_id
+    return None
+
+def method_8(snapshot):
+    """Extract the user ID from HTML comments."""
+    match = HTML_COMMENT_USER_ID_RE.search(snapshot.page_source)
+    if match:
+        user_id = match.group(1)
+        logger.info(f"Method 8: Found user ID in HTML comment: {user_id}")
+        return user_id
+    return None
+
+def find_json_user_id(root):
+    """
+    Find the first numeric "user_id"/"id" value in nested JSON data.
+    
+    Walks the data with an explicit stack rather than recursion and stops
+    at the first hit.
+    
+    Args:
+        root: Parsed JSON data
+        
+    Returns:
+        Tuple of (path, user ID), or (None, None) if not found
+    """
+    stack = [("", root)]
+    while stack:
+        path, data = stack.pop()
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key in ("user_id", "id") and isinstance(value, (str, int)) and str(value).isdigit():
+                    return f"{path}.{key}" if path else key, str(value)
+                if isinstance(value, (dict, list)):
+                    stack.append((f"{path}.{key}" if path else key, value))
+        elif isinstance(data, list):
+            stack.extend((f"{path}[{i}]", item) for i, item in enumerate(data) if isinstance(item, (dict, list)))
+    return None, None
+
+def method_9(snapshot):
+    """Extract the first user ID found in the page's JSON script blocks."""
+    if snapshot.html_tree is None:
+        return None
+    
+    for i, script in enumerate(snapshot.html_tree.xpath(JSON_SCRIPTS_XPATH)):
+        try:
+            json_data = parse_json(script.text or "")
+            
+            # Save for debugging
+            if DEBUG_DUMP:
+                dump_debug_json(json_data, f"debug_json_{i}.json")
+                logger.info(f"JSON data {i} saved to debug_json_{i}.json")
+            
+            # Try to find user ID in the JSON data
+            if isinstance(json_data, dict):
+                path, user_id = find_json_user_id(json_data)
+                if user_id:
+                    logger.info(f"Method 9: Found potential user ID in JSON {i} at {path}: {user_id}")
+                    return user_id
+        except Exception as e:
+            logger.debug(f"Error processing JSON {i}: {str(e)}")
+    return None
+
+def _user_id_from_storage(snapshot, storage, storage_name, method_number):
+    """
+    Extract the user ID from captured Web Storage entries.
+    
+    Args:
+        snapshot: PageSnapshot the entries were captured into
+        storage: Dictionary with "keys" and user/id-related "entries", or None
+        storage_name: "localStorage" or "sessionStorage", used in log messages
+        method_number: Method number used in log messages
+        
+    Returns:
+        The user ID, or None if not found
+    """
+    if not storage:
+        return None
+    
+    logger.info(f"Found {storage_name} keys: {storage['keys']}")
+    
+    user_id = None
+    for key, value in storage["entries"].items():
+        logger.info(f"{storage_name} key {key} has value: {value}")
+        
+        # Try to parse as JSON
+        try:
+            json_value = json.loads(value)
+            if isinstance(json_value, dict) and ("id" in json_value or "user_id" in json_value):
+                user_id = json_value.get("id") or json_value.get("user_id")
+                logger.info(f"Method {method_number}: Found user ID in {storage_name} key {key}: {user_id}")
+        except Exception:
+            # Try regex
+            found_id, pattern = search_user_id(snapshot.user_id_regex, value)
+            if found_id:
+                user_id = found_id
+                logger.info(f"Method {method_number}: Found user ID in {storage_name} key {key} using pattern '{pattern}': {user_id}")
+    return str(user_id) if user_id else None
+
+def method_10(snapshot):
+    """Extract the user ID from localStorage."""
+    return _user_id_from_storage(snapshot, snapshot.local_storage, "localStorage", 10)
+
+def method_11(snapshot):
+    """Extract the user ID from sessionStorage."""
+    return _user_id_from_storage(snapshot, snapshot.session_storage, "sessionStorage", 11)
+
+def method_12(snapshot):
+    """Extract the user ID from cookies, preferring ds_user_id."""
+    if snapshot.cookies is None:
+        return None
+    
+    logger.info(f"Found {len(snapshot.cookies)} cookies")
+    
+    user_id = None
+    for cookie in snapshot.cookies:
+        if "user" in cookie["name"].lower() or "id" in cookie["name"].lower():
+            logger.info(f"Cookie {cookie['name']} has value: {cookie['value']}")
+            
+            # Try regex
+            found_id, pattern = search_user_id(snapshot.user_id_regex, cookie["value"])
+            if found_id:
+                user_id = found_id
+                logger.info(f"Method 12: Found user ID in cookie {cookie['name']} using pattern '{pattern}': {user_id}")
+            
+            # Check specifically for ds_user_id cookie
+            if cookie["name"] == "ds_user_id":
+                logger.info(f"Found ds_user_id cookie with value: {cookie['value']}")
+                if cookie["value"].isdigit():
+                    logger.info(f"Method 12: Found user ID in ds_user_id cookie: {cookie['value']}")
+                    user_id = cookie["value"]
+    return user_id
+
+# Extraction methods in priority order; the first non-None result wins
+USER_ID_METHODS = [
+    method_1, method_2, method_3, method_4, method_5, method_6,
+    method_7, method_8, method_9, method_10, method_11, method_12,
+]
+
+def _run_method(method, snapshot):
+    """
+    Run one extraction method, logging instead of raising on failure.
+    
+    Args:
+        method: Extraction method taking a PageSnapshot
+        snapshot: PageSnapshot to extract from
+        
+    Returns:
+        The user ID found by the method, or None
+    """
+    try:
+        return method(snapshot)
+    except Exception as e:
+        logger.warning(f"{method.__name__.replace('_', ' ').capitalize()} failed: {str(e)}")
+        return None
+
+def extract_user_id(snapshot, max_workers=USER_ID_METHOD_WORKERS):
+    """
+    Run all extraction methods over a snapshot concurrently.
+    
+    The methods only parse data already captured from the browser, so the
+    regex scans and JSON parsing overlap with the debug file writes.
+    
+    Args:
+        snapshot: PageSnapshot to extract from
+        max_workers: Number of worker threads
+        
+    Returns:
+        The highest-priority user ID found, or None
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda method: _run_method(method, snapshot), USER_ID_METHODS))
+    return next(filter(None, results), None)
+
+def test_extract_user_id():
+    """
+    Test function to extract user ID from Instagram profile page.
+    
+    Returns:
+        The extracted user ID, or None if it could not be found
+    """
+    # Get username
+    username = input("Enter Instagram username to test (leave blank for your own account): ")
+    if not username:
+        # Reuse the credentials resolved earlier in this session, if any
+        username, _, _ = get_resolved_credentials()
+        if not username:
+            return
+    
+    # Cookies are stored as JSON; convert a legacy pickled file once if present
+    cookie_file = Path(cookie_path(username))
+    if not cookie_file.exists():
+        migrate_legacy_cookies(username)
+    
+    # Initialize browser (reused from the pool when one is idle)
+    browser = debug_browser_pool.acquire()
+    wait = WebDriverWait(browser, 10)
     
     try:
         # Try to use cookies first if they exist
@@ -235,27 +709,34 @@ def test_extract_user_id():
             logger.info(f"Found existing cookies for {username}")
             
             # First navigate to Instagram
-            browser.get("https://www.instagram.com/")
-            time.sleep(3)
+            browser.get(INSTAGRAM_URL)
+            wait_for(wait, PAGE_BODY)
             
             # Load cookies
             logger.info(f"Loading cookies from {cookie_file}")
-            with open(cookie_file, "rb") as f:
-                cookies = pickle.load(f)
-                for cookie in cookies:
-                    # Handle domain issues that might cause cookie rejection
-                    if "domain" in cookie and cookie["domain"].startswith("."):
-                        cookie["domain"] = cookie["domain"][1:]
-                    try:
-                        browser.add_cookie(cookie)
-                    except Exception as e:
-                        logger.warning(f"Could not add cookie {cookie.get('name')}: {str(e)}")
+            cookies = read_cookie_file(cookie_file)
+            for cookie in cookies:
+                # Handle domain issues that might cause cookie rejection
+                if "domain" in cookie and cookie["domain"].startswith("."):
+                    cookie["domain"] = cookie["domain"][1:]
+            try:
+                # One CDP call for the whole list instead of one add_cookie per cookie
+                set_cookies(browser, cookies)
+            except Exception as e:
+                logger.warning(f"Could not add cookies: {str(e)}")
             
             # Refresh the page to apply cookies
             browser.refresh()
-            time.sleep(5)
+            wait_for(wait, LOGGED_IN_INDICATOR)
             
             logger.info("Cookies loaded, proceeding with test")
+            
+            # The saved cookies belong to this username, so its ds_user_id cookie
+            # is the profile's user ID and the page-based methods can be skipped
+            ds_user_id = browser.get_cookie("ds_user_id")
+            if ds_user_id and ds_user_id["value"].isdigit():
+                logger.info(f"Found user ID in ds_user_id cookie: {ds_user_id['value']}")
+                return ds_user_id["value"]
         
         # Navigate to profile
         profile_url = f"https://www.instagram.com/{username}/"
@@ -263,314 +744,39 @@ def test_extract_user_id():
         browser.get(profile_url)
         
         # Wait for page to load
-        time.sleep(5)
-        
-        # Save page source for debugging
-        with open("debug_page_source.html", "w", encoding="utf-8") as f:
-            f.write(browser.page_source)
-        
-        logger.info("Page source saved to debug_page_source.html")
+        wait_for(wait, PROFILE_HEADER)
         
-        # Try different methods to extract user ID
-        
-        # Method 1: Extract from page source using regex
+        # Fetch the page source once and reuse it for every method below
         page_source = browser.page_source
         
-        user_id_patterns = [
-            r'"user_id":"(\d+)"',
-            r'"profilePage_(\d+)"',
-            r'"owner":{"id":"(\d+)"',
-            r'"id":"(\d+)","username":"{}"'.format(username),
-            r'instagram://user\?username={}&amp;userid=(\d+)'.format(username)
-        ]
-        
-        for pattern in user_id_patterns:
-            match = re.search(pattern, page_source)
-            if match:
-                user_id = match.group(1)
-                logger.info(f"Method 1: Found user ID using pattern '{pattern}': {user_id}")
-                break
-        
-        # Method 2: Extract from window._sharedData
-        try:
-            shared_data = browser.execute_script("return window._sharedData;")
-            if shared_data:
-                logger.info("Found window._sharedData")
-                
-                # Save for debugging
-                with open("debug_shared_data.json", "w") as f:
-                    json.dump(shared_data, f, indent=2)
-                
-                logger.info("Shared data saved to debug_shared_data.json")
-                
-                # Try to extract user ID
-                if (shared_data.get("entry_data") and 
-                    shared_data["entry_data"].get("ProfilePage") and 
-                    shared_data["entry_data"]["ProfilePage"][0].get("graphql") and 
-                    shared_data["entry_data"]["ProfilePage"][0]["graphql"].get("user")):
-                    
-                    user_id = shared_data["entry_data"]["ProfilePage"][0]["graphql"]["user"].get("id")
-                    if user_id:
-                        logger.info(f"Method 2: Found user ID from _sharedData: {user_id}")
-        except Exception as e:
-            logger.warning(f"Method 2 failed: {str(e)}")
-        
-        # Method 3: Extract from script tags
-        try:
-            scripts = browser.find_elements(By.TAG_NAME, "script")
-            logger.info(f"Found {len(scripts)} script tags")
-            
-            for i, script in enumerate(scripts):
-                try:
-                    script_content = script.get_attribute("innerHTML")
-                    if script_content and username in script_content:
-                        logger.info(f"Found script {i} containing username")
-                        
-                        # Save script content for debugging
-                        with open(f"debug_script_{i}.js", "w", encoding="utf-8") as f:
-                            f.write(script_content)
-                        
-                        # Check for user ID in script content
-                        for pattern in user_id_patterns:
-                            match = re.search(pattern, script_content)
-                            if match:
-                                user_id = match.group(1)
-                                logger.info(f"Method 3: Found user ID in script {i} using pattern '{pattern}': {user_id}")
-                                break
-                except Exception as e:
-                    logger.debug(f"Error processing script {i}: {str(e)}")
-        except Exception as e:
-            logger.warning(f"Method 3 failed: {str(e)}")
-        
-        # Method 4: Extract from additional data
-        try:
-            additional_data = browser.execute_script("""
-                const result = {};
-                for (const key in window) {
-                    if (key.startsWith('__additionalData')) {
-                        result[key] = window[key];
-                    }
-                }
-                return result;
-            """)
-            
-            if additional_data:
-                logger.info(f"Found additional data: {list(additional_data.keys())}")
-                
-                # Save for debugging
-                with open("debug_additional_data.json", "w") as f:
-                    json.dump(str(additional_data), f, indent=2)
-                
-                logger.info("Additional data saved to debug_additional_data.json")
-        except Exception as e:
-            logger.warning(f"Method 4 failed: {str(e)}")
-        
-        # Method 5: Try to find user ID in any JavaScript object
-        try:
-            js_objects = browser.execute_script("""
-                const result = {};
-                for (const key in window) {
-                    try {
-                        const value = window[key];
-                        if (value && typeof value === 'object') {
-                            if (value.user_id || 
-                                (value.user && value.user.id) || 
-                                (value.data && value.data.user && value.data.user.id)) {
-                                result[key] = {
-                                    user_id: value.user_id || (value.user && value.user.id) || (value.data && value.data.user && value.data.user.id)
-                                };
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                }
-                return result;
-            """)
-            
-            if js_objects:
-                logger.info(f"Found JavaScript objects with user ID: {list(js_objects.keys())}")
-                
-                for key, value in js_objects.items():
-                    logger.info(f"Object {key} has user ID: {value.get('user_id')}")
-                
-                # Save for debugging
-                with open("debug_js_objects.json", "w") as f:
-                    json.dump(str(js_objects), f, indent=2)
-                
-                logger.info("JavaScript objects saved to debug_js_objects.json")
-        except Exception as e:
-            logger.warning(f"Method 5 failed: {str(e)}")
-        
-        # Method 6: Try to extract from meta tags
-        try:
-            meta_tags = browser.find_elements(By.TAG_NAME, "meta")
-            logger.info(f"Found {len(meta_tags)} meta tags")
-            
-            for meta in meta_tags:
-                try:
-                    content = meta.get_attribute("content")
-                    if content and username in content:
-                        logger.info(f"Found meta tag with content containing username: {content}")
-                        
-                        # Check for user ID in content
-                        for pattern in user_id_patterns:
-                            match = re.search(pattern, content)
-                            if match:
-                                user_id = match.group(1)
-                                logger.info(f"Method 6: Found user ID in meta tag using pattern '{pattern}': {user_id}")
-                                break
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.warning(f"Method 6 failed: {str(e)}")
-        
-        # Method 7: Try to extract from HTML attributes
-        try:
-            elements_with_data = browser.find_elements(By.CSS_SELECTOR, "[data-user-id]")
-            for element in elements_with_data:
-                user_id = element.get_attribute("data-user-id")
-                if user_id:
-                    logger.info(f"Method 7: Found user ID in data-user-id attribute: {user_id}")
-                    break
-        except Exception as e:
-            logger.warning(f"Method 7 failed: {str(e)}")
-        
-        # Method 8: Try to extract from HTML comments
-        try:
-            html = browser.page_source
-            comment_pattern = r"<!--.*?user_id[\"']?\s*:\s*[\"']?(\d+)[\"']?.*?-->"
-            match = re.search(comment_pattern, html, re.DOTALL)
-            if match:
-                user_id = match.group(1)
-                logger.info(f"Method 8: Found user ID in HTML comment: {user_id}")
-        except Exception as e:
-            logger.warning(f"Method 8 failed: {str(e)}")
-        
-        # Method 9: Try to extract from any JSON data in the page
-        try:
-            json_pattern = r'<script[^>]*type=["\'](application|text)\/json["\'][^>]*>(.*?)<\/script>'
-            json_matches = re.finditer(json_pattern, page_source, re.DOTALL)
-            
-            for i, match in enumerate(json_matches):
-                try:
-                    json_text = match.group(2)
-                    json_data = json.loads(json_text)
-                    
-                    # Save for debugging
-                    with open(f"debug_json_{i}.json", "w") as f:
-                        json.dump(json_data, f, indent=2)
-                    
-                    logger.info(f"JSON data {i} saved to debug_json_{i}.json")
-                    
-                    # Try to find user ID in the JSON data
-                    if isinstance(json_data, dict):
-                        def find_user_id(data, path=""):
-                            if isinstance(data, dict):
-                                for key, value in data.items():
-                                    if key in ["user_id", "id"] and isinstance(value, (str, int)) and str(value).isdigit():
-                                        logger.info(f"Method 9: Found potential user ID in JSON at {path}.{key}: {value}")
-                                    
-                                    if isinstance(value, (dict, list)):
-                                        find_user_id(value, f"{path}.{key}" if path else key)
-                            elif isinstance(data, list):
-                                for i, item in enumerate(data):
-                                    if isinstance(item, (dict, list)):
-                                        find_user_id(item, f"{path}[{i}]")
-                        
-                        find_user_id(json_data)
-                except Exception as e:
-                    logger.debug(f"Error processing JSON {i}: {str(e)}")
-        except Exception as e:
-            logger.warning(f"Method 9 failed: {str(e)}")
-        
-        # Method 10: Try to extract from localStorage
-        try:
-            local_storage = browser.execute_script("return Object.keys(window.localStorage);")
-            logger.info(f"Found localStorage keys: {local_storage}")
-            
-            for key in local_storage:
-                if "user" in key.lower() or "id" in key.lower():
-                    value = browser.execute_script(f"return window.localStorage.getItem('{key}');")
-                    logger.info(f"localStorage key {key} has value: {value}")
-                    
-                    # Try to parse as JSON
-                    try:
-                        json_value = json.loads(value)
-                        if isinstance(json_value, dict) and ("id" in json_value or "user_id" in json_value):
-                            user_id = json_value.get("id") or json_value.get("user_id")
-                            logger.info(f"Method 10: Found user ID in localStorage key {key}: {user_id}")
-                    except:
-                        # Try regex
-                        for pattern in user_id_patterns:
-                            match = re.search(pattern, value)
-                            if match:
-                                user_id = match.group(1)
-                                logger.info(f"Method 10: Found user ID in localStorage key {key} using pattern '{pattern}': {user_id}")
-                                break
-        except Exception as e:
-            logger.warning(f"Method 10 failed: {str(e)}")
+        # Save page source for debugging
+        if DEBUG_DUMP:
+            Path("debug_page_source.html").write_bytes(page_source.encode("utf-8"))
+            logger.info("Page source saved to debug_page_source.html")
         
-        # Method 11: Try to extract from sessionStorage
-        try:
-            session_storage = browser.execute_script("return Object.keys(window.sessionStorage);")
-            logger.info(f"Found sessionStorage keys: {session_storage}")
-            
-            for key in session_storage:
-                if "user" in key.lower() or "id" in key.lower():
-                    value = browser.execute_script(f"return window.sessionStorage.getItem('{key}');")
-                    logger.info(f"sessionStorage key {key} has value: {value}")
-                    
-                    # Try to parse as JSON
-                    try:
-                        json_value = json.loads(value)
-                        if isinstance(json_value, dict) and ("id" in json_value or "user_id" in json_value):
-                            user_id = json_value.get("id") or json_value.get("user_id")
-                            logger.info(f"Method 11: Found user ID in sessionStorage key {key}: {user_id}")
-                    except:
-                        # Try regex
-                        for pattern in user_id_patterns:
-                            match = re.search(pattern, value)
-                            if match:
-                                user_id = match.group(1)
-                                logger.info(f"Method 11: Found user ID in sessionStorage key {key} using pattern '{pattern}': {user_id}")
-                                break
-        except Exception as e:
-            logger.warning(f"Method 11 failed: {str(e)}")
+        # Capture everything from the browser first, then run all extraction
+        # methods on the snapshot concurrently
+        snapshot = take_page_snapshot(browser, username, page_source)
+        user_id = extract_user_id(snapshot)
         
-        # Method 12: Try to extract from cookies
-        try:
-            cookies = browser.get_cookies()
-            logger.info(f"Found {len(cookies)} cookies")
-            
-            for cookie in cookies:
-                if "user" in cookie["name"].lower() or "id" in cookie["name"].lower():
-                    logger.info(f"Cookie {cookie['name']} has value: {cookie['value']}")
-                    
-                    # Try regex
-                    for pattern in user_id_patterns:
-                        match = re.search(pattern, cookie["value"])
-                        if match:
-                            user_id = match.group(1)
-                            logger.info(f"Method 12: Found user ID in cookie {cookie['name']} using pattern '{pattern}': {user_id}")
-                            break
-                    
-                    # Check specifically for ds_user_id cookie
-                    if cookie["name"] == "ds_user_id":
-                        logger.info(f"Found ds_user_id cookie with value: {cookie['value']}")
-                        if cookie["value"].isdigit():
-                            logger.info(f"Method 12: Found user ID in ds_user_id cookie: {cookie['value']}")
-        except Exception as e:
-            logger.warning(f"Method 12 failed: {str(e)}")
+        if user_id:
+            logger.info(f"Extracted user ID: {user_id}")
+        else:
+            logger.warning("No method found a user ID")
         
         logger.info("Test completed. Check the logs for results.")
+        return user_id
         
     except Exception as e:
         logger.error(f"Test failed: {str(e)}")
+        return None
     finally:
-        # Close browser
-        browser.quit()
+        # Return the browser to the pool; it is quit at interpreter exit
+        debug_browser_pool.release(browser)
 
 if __name__ == "__main__":
     # Only run the test_extract_user_id function
-    test_extract_user_id() 
\ No newline at end of file
+    try:
+        test_extract_user_id()
+    finally:
+        forget_credentials() 
\ No newline at end of file
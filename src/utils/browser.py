@@ -1,18 +1,122 @@
+import atexit
+import os
+import queue
+from contextlib import contextmanager
 import random
+import threading
 import time
 import undetected_chromedriver as uc
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
 from src.config.config import (
     HEADLESS_MODE,
     USER_AGENT,
     USE_PROXY,
     PROXY_LIST_PATH,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    WEBDRIVER_POOL_MAXSIZE,
+    BROWSER_POOL_SIZE
+)
+
+# Cookie fields shared by Selenium and CDP (Selenium's "expiry" becomes "expires")
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+
+# Chrome flags that cut memory/CPU use; only the DOM and embedded JSON are scraped
+RESOURCE_SAVING_ARGUMENTS = (
+    '--blink-settings=imagesEnabled=false',
+)
+
+# Background services (sync, metrics, component updates, first-run setup) that
+# only steal CPU from the page in headless runs; headed runs keep the defaults
+HEADLESS_ARGUMENTS = (
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-default-apps',
+    '--metrics-recording-only',
+    '--no-first-run'
+)
+
+# Chrome features to turn off. Chrome only honours the last --disable-features
+# flag, so these are joined into a single one.
+DISABLED_FEATURES = ('IsolateOrigins', 'site-per-process')
+HEADLESS_DISABLED_FEATURES = ('Translate', 'TranslateUI', 'OptimizationHints', 'MediaRouter', 'BlinkGenPropertyTrees')
+
+# Containers (Docker, podman, Kubernetes, most CI runners) usually get a 64MB
+# /dev/shm that Chrome quickly exhausts. Below this size Chrome has to use /tmp
+# instead and skip the zygote process, which needs the sandbox.
+MIN_DEV_SHM_BYTES = 512 * 1024 * 1024
+SMALL_DEV_SHM_ARGUMENTS = (
+    '--disable-dev-shm-usage',
+    '--no-zygote'
+)
+
+# Clear the page's sessionStorage (not covered by Storage.clearDataForOrigin)
+# and return its origin
+CLEAR_SESSION_STORAGE_JS = """
+try {
+    window.sessionStorage.clear();
+} catch (e) {}
+return window.location.origin;
+"""
+
+# Last successful login check per browser session: {session_id: timestamp}.
+# Read by is_logged_in in src.scrapers.login; kept here so that code changing
+# a browser's cookies (set_cookies, BrowserPool.release) can drop the entry.
+login_state_cache = {}
+
+# Pixels per second for CDP scroll gestures; fast enough to finish in one step
+SCROLL_GESTURE_SPEED = 50000
+
+# Seconds between checks while waiting for an element
+ELEMENT_POLL_FREQUENCY = 0.1
+
+# Element existence checks run in the page
+CSS_ELEMENT_EXISTS_JS = "return !!document.querySelector(arguments[0]);"
+XPATH_ELEMENT_EXISTS_JS = (
+    "return document.evaluate(arguments[0], document, null, XPathResult.BOOLEAN_TYPE, null).booleanValue;"
+)
+
+# Keep scrolling to the bottom, pausing a random time between arguments[2]
+# and arguments[3] ms after each scroll, until the page stops growing past
+# arguments[0] or arguments[1] scrolls are done. Reports the number of scrolls.
+SCROLL_UNTIL_STABLE_JS = """
+const [startHeight, maxScrolls, minPause, maxPause, done] = arguments;
+let lastHeight = startHeight;
+let scrolls = 0;
+(function step() {
+    window.scrollTo(0, document.body.scrollHeight);
+    scrolls++;
+    setTimeout(() => {
+        const height = document.body.scrollHeight;
+        if (height === lastHeight || scrolls >= maxScrolls) {
+            done(scrolls);
+            return;
+        }
+        lastHeight = height;
+        step();
+    }, minPause + Math.random() * (maxPause - minPause));
+})();
+"""
+
+# Most scrolls run by one SCROLL_UNTIL_STABLE_JS call, and the pause range (ms)
+# after each of them
+JS_SCROLL_BATCH = 20
+JS_SCROLL_PAUSE_MS = (500, 1500)
+
+# New page height if the page grew past arguments[0], otherwise null
+PAGE_GREW_JS = """
+const height = document.body.scrollHeight;
+return height > arguments[0] ? height : null;
+"""
+
+# Static assets not needed while only the page structure matters (e.g. during login)
+BLOCKED_RESOURCE_PATTERNS = (
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.mp4",
+    "*.woff", "*.woff2", "*.ttf", "*.css"
 )
 
 def get_user_agent():
@@ -51,15 +155,22 @@ def get_user_agent():
     
     return random.choice(user_agents)
 
+# Parsed proxy list, re-read only when the file's mtime changes
+_PROXY_CACHE = {"mtime": None, "list": []}
+
 def get_random_proxy():
     """Get a random proxy from the proxy list file."""
     if not USE_PROXY:
         return None
     
     try:
-        with open(PROXY_LIST_PATH, 'r') as f:
-            proxies = [line.strip() for line in f if line.strip()]
+        mtime = os.stat(PROXY_LIST_PATH).st_mtime
+        if mtime != _PROXY_CACHE["mtime"]:
+            with open(PROXY_LIST_PATH, 'r') as f:
+                _PROXY_CACHE["list"] = [line.strip() for line in f if line.strip()]
+            _PROXY_CACHE["mtime"] = mtime
         
+        proxies = _PROXY_CACHE["list"]
         if not proxies:
             print("Warning: Proxy list is empty. Proceeding without proxy.")
             return None
@@ -69,10 +180,93 @@ def get_random_proxy():
         print(f"Warning: Proxy list file {PROXY_LIST_PATH} not found. Proceeding without proxy.")
         return None
 
-def setup_browser():
-    """Set up and return an undetected Chrome browser instance."""
-    # Create Chrome options
+def resize_connection_pool(browser, maxsize=WEBDRIVER_POOL_MAXSIZE):
+    """
+    Allow several keep-alive HTTP connections to the WebDriver server.
+    
+    Selenium's urllib3 pool keeps a single connection by default, so commands
+    sent while another is in flight (helper threads, rapid ActionChains)
+    open and drop extra sockets and log "connection pool is full".
+    
+    Args:
+        browser: The browser instance
+        maxsize: Maximum number of pooled connections
+    """
+    try:
+        pool_manager = browser.command_executor._conn
+        pool_manager.connection_pool_kw["maxsize"] = maxsize
+        pool_manager.clear()  # Existing pools are recreated with the new size
+    except Exception as e:
+        print(f"Could not resize WebDriver connection pool: {e}")
+
+def _dev_shm_too_small():
+    """Check whether /dev/shm is missing or smaller than MIN_DEV_SHM_BYTES."""
+    try:
+        stats = os.statvfs('/dev/shm')
+    except (AttributeError, OSError):
+        # No statvfs (Windows) means Chrome doesn't use /dev/shm either; a
+        # missing /dev/shm on Linux is the case the flag exists for
+        return hasattr(os, 'statvfs')
+    return stats.f_frsize * stats.f_blocks < MIN_DEV_SHM_BYTES
+
+def resource_saving_arguments(headless=HEADLESS_MODE):
+    """
+    Build the Chrome flags that cut memory and CPU use.
+    
+    Args:
+        headless: Whether Chrome runs headless; only then are background
+            services turned off
+        
+    Returns:
+        List of command-line arguments
+    """
+    arguments = list(RESOURCE_SAVING_ARGUMENTS)
+    disabled_features = list(DISABLED_FEATURES)
+    if headless:
+        arguments.extend(HEADLESS_ARGUMENTS)
+        disabled_features.extend(HEADLESS_DISABLED_FEATURES)
+    if _dev_shm_too_small():
+        arguments.extend(SMALL_DEV_SHM_ARGUMENTS)
+    arguments.append(f"--disable-features={','.join(disabled_features)}")
+    return arguments
+
+# Chrome flags that are the same for every launch, built once at import.
+# setup_browser copies them and only adds the per-launch ones (profile, user
+# agent, proxy).
+BASE_CHROME_ARGUMENTS = (
+    # Make the browser more stealthy
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--no-sandbox',
+    '--disable-infobars',
+    '--disable-browser-side-navigation',
+    # Skip image decoding, and in headless runs background services, the
+    # scraper doesn't need
+    *resource_saving_arguments(),
+    # The new headless mode renders like headed Chrome (GPU compositing
+    # included), so --disable-gpu is no longer passed
+    *(('--headless=new',) if HEADLESS_MODE else ())
+)
+
+def setup_browser(profile_dir=None):
+    """
+    Set up and return an undetected Chrome browser instance.
+    
+    Args:
+        profile_dir: Persistent Chrome user data directory to launch with, so
+            caches and cookies survive restarts. A fresh temporary profile is
+            used if None.
+    """
+    # Create Chrome options, starting from a copy of the shared flags instead
+    # of adding them one at a time
     options = uc.ChromeOptions()
+    options._arguments = list(BASE_CHROME_ARGUMENTS)
+    
+    # Reuse a persistent profile: later launches start warm instead of
+    # running Chrome's first-run setup again
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+        options.add_argument('--profile-directory=Default')
     
     # Set user agent
     options.add_argument(f'user-agent={get_user_agent()}')
@@ -82,18 +276,12 @@ def setup_browser():
     if proxy:
         options.add_argument(f'--proxy-server={proxy}')
     
-    # Add additional options to make browser more stealthy
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_argument('--disable-extensions')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-infobars')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-browser-side-navigation')
-    options.add_argument('--disable-gpu')
+    # Don't load images
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     
-    # Handle headless mode
-    if HEADLESS_MODE:
-        options.add_argument('--headless')
+    # Return from get() at DOMContentLoaded rather than after every image and
+    # iframe has loaded; callers wait for the elements they need
+    options.page_load_strategy = "eager"
     
     try:
         # Create and return the browser instance with headless parameter
@@ -102,6 +290,7 @@ def setup_browser():
             use_subprocess=True
         )
         browser.set_page_load_timeout(REQUEST_TIMEOUT)
+        resize_connection_pool(browser)
         return browser
     except Exception as e:
         print(f"Error creating Chrome instance with options: {str(e)}")
@@ -109,22 +298,27 @@ def setup_browser():
         try:
             browser = uc.Chrome(use_subprocess=True)
             browser.set_page_load_timeout(REQUEST_TIMEOUT)
+            resize_connection_pool(browser)
             return browser
         except Exception as e:
             print(f"Error creating Chrome instance with fallback: {str(e)}")
             raise
 
-def random_sleep(min_seconds=1, max_seconds=3):
-    """Sleep for a random amount of time between min and max seconds."""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+def random_sleep(min_seconds=1, max_seconds=3, rng=None):
+    """Sleep for a random amount of time between min and max seconds, using rng if given."""
+    time.sleep((rng or random).uniform(min_seconds, max_seconds))
 
 def scroll_to_bottom(browser, scroll_pause_time=1.0, num_scrolls=None):
     """
     Scroll to the bottom of a page.
     
+    Each scroll is a single CDP scroll gesture run inside the browser, after
+    which we wait (up to scroll_pause_time) for lazy-loaded content to extend
+    the page. Falls back to scrolling with JavaScript if CDP is not available.
+    
     Args:
         browser: The browser instance
-        scroll_pause_time: Time to pause between scrolls
+        scroll_pause_time: Time to wait for new content after each scroll
         num_scrolls: Maximum number of scrolls (None for unlimited)
     """
     # Get scroll height
@@ -132,19 +326,61 @@ def scroll_to_bottom(browser, scroll_pause_time=1.0, num_scrolls=None):
     
     scrolls = 0
     while num_scrolls is None or scrolls < num_scrolls:
-        # Scroll down
-        browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        
-        # Add some randomness to the scrolling
-        random_sleep(0.5, 1.5)
+        # Scroll down by the whole page height in one gesture
+        try:
+            browser.execute_cdp_cmd("Input.synthesizeScrollGesture", {
+                "x": 10,
+                "y": 10,
+                "yDistance": -last_height,
+                "speed": SCROLL_GESTURE_SPEED,
+                "repeatCount": 0
+            })
+        except Exception:
+            _scroll_to_bottom_with_js(browser, last_height, num_scrolls, scrolls)
+            return
         
-        # Calculate new scroll height and compare with last scroll height
-        new_height = browser.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
+        # Wait for lazy-loaded content to grow the page instead of sleeping a fixed time
+        try:
+            last_height = WebDriverWait(browser, scroll_pause_time, poll_frequency=0.1).until(
+                lambda b: b.execute_script(PAGE_GREW_JS, last_height)
+            )
+        except TimeoutException:
             break
-        last_height = new_height
         scrolls += 1
 
+def _scroll_to_bottom_with_js(browser, last_height, num_scrolls=None, scrolls=0):
+    """
+    Scroll to the bottom of a page with window.scrollTo (fallback without CDP).
+    
+    The scroll loop and the random pauses between scrolls run inside the
+    page, so waiting for lazy-loaded content takes no driver round-trips.
+    
+    Args:
+        browser: The browser instance
+        last_height: Page height before the first scroll
+        num_scrolls: Maximum number of scrolls (None for unlimited)
+        scrolls: Number of scrolls already done
+    """
+    min_pause, max_pause = JS_SCROLL_PAUSE_MS
+    previous_timeout = browser.timeouts.script
+    # Leave room for every pause of a batch plus slack for the page itself
+    browser.set_script_timeout(JS_SCROLL_BATCH * max_pause / 1000 + 10)
+    try:
+        while num_scrolls is None or scrolls < num_scrolls:
+            batch = JS_SCROLL_BATCH if num_scrolls is None else min(JS_SCROLL_BATCH, num_scrolls - scrolls)
+            done = browser.execute_async_script(
+                SCROLL_UNTIL_STABLE_JS, last_height, batch, min_pause, max_pause
+            )
+            scrolls += done
+            # Fewer scrolls than asked for means the page stopped growing
+            if done < batch:
+                break
+            last_height = browser.execute_script("return document.body.scrollHeight")
+    except TimeoutException:
+        print("Scrolling with JavaScript timed out")
+    finally:
+        browser.set_script_timeout(previous_timeout)
+
 def wait_for_element(browser, selector, by=By.CSS_SELECTOR, timeout=10):
     """
     Wait for an element to be present on the page.
@@ -159,7 +395,12 @@ def wait_for_element(browser, selector, by=By.CSS_SELECTOR, timeout=10):
         The element if found, None otherwise
     """
     try:
-        element = WebDriverWait(browser, timeout).until(
+        # Poll faster than WebDriverWait's 0.5 s default so elements that show up
+        # quickly are returned quickly; stale references during re-renders just retry
+        element = WebDriverWait(
+            browser, timeout, poll_frequency=ELEMENT_POLL_FREQUENCY,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        ).until(
             EC.presence_of_element_located((by, selector))
         )
         return element
@@ -167,6 +408,134 @@ def wait_for_element(browser, selector, by=By.CSS_SELECTOR, timeout=10):
         print(f"Timeout waiting for element: {selector}")
         return None
 
+def wait_for_condition(browser, condition, timeout=10, poll_frequency=0.5):
+    """
+    Wait until a condition is met instead of sleeping for a fixed time.
+    
+    Args:
+        browser: The browser instance
+        condition: A callable taking the browser (e.g. an expected_conditions object)
+        timeout: Maximum time to wait in seconds
+        poll_frequency: Seconds between condition checks
+        
+    Returns:
+        The condition's truthy result if met, False on timeout
+    """
+    try:
+        return WebDriverWait(browser, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        return False
+
+def wait_for_page_load(browser, timeout=10, poll_frequency=0.5):
+    """
+    Wait until the current document has finished loading.
+    
+    Args:
+        browser: The browser instance
+        timeout: Maximum time to wait in seconds
+        poll_frequency: Seconds between readyState checks
+        
+    Returns:
+        True if the page finished loading, False on timeout
+    """
+    return bool(wait_for_condition(
+        browser,
+        lambda b: b.execute_script("return document.readyState") == "complete",
+        timeout,
+        poll_frequency
+    ))
+
+def _to_cdp_cookie(cookie):
+    """
+    Convert a Selenium cookie dict to a CDP Network.CookieParam.
+    
+    Args:
+        cookie: Cookie dictionary as returned by browser.get_cookies()
+        
+    Returns:
+        Dictionary in the CDP cookie format
+    """
+    cdp_cookie = {key: cookie[key] for key in CDP_COOKIE_FIELDS if key in cookie}
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    return cdp_cookie
+
+def invalidate_login_state(browser):
+    """Forget the cached login state for this browser session."""
+    login_state_cache.pop(getattr(browser, "session_id", None), None)
+
+def set_cookies(browser, cookies):
+    """
+    Add several cookies to the browser in a single round-trip where possible.
+    
+    Uses the Chrome DevTools Network.setCookies command and falls back to one
+    add_cookie call per cookie if CDP is not available.
+    
+    Args:
+        browser: The browser instance
+        cookies: List of cookie dictionaries as returned by browser.get_cookies()
+    """
+    if not cookies:
+        return
+    
+    # New cookies can change who (if anyone) the session is logged in as
+    invalidate_login_state(browser)
+    
+    try:
+        browser.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp_cookie(c) for c in cookies]})
+        return
+    except Exception as e:
+        print(f"CDP cookie injection failed, falling back to add_cookie: {e}")
+    
+    for cookie in cookies:
+        browser.add_cookie(cookie)
+
+def block_resources(browser, url_patterns=BLOCKED_RESOURCE_PATTERNS):
+    """
+    Stop the browser from downloading matching resources (images, fonts, etc.).
+    
+    Args:
+        browser: The browser instance
+        url_patterns: URL wildcard patterns to block; an empty list unblocks everything
+        
+    Returns:
+        True if the block list was applied, False if CDP is not available
+    """
+    try:
+        browser.execute_cdp_cmd("Network.enable", {})
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(url_patterns)})
+        return True
+    except Exception as e:
+        print(f"Could not set blocked URLs: {e}")
+        return False
+
+def unblock_resources(browser):
+    """
+    Allow all resources to load again after block_resources().
+    
+    Args:
+        browser: The browser instance
+    """
+    block_resources(browser, [])
+
+def set_user_agent(browser, user_agent):
+    """
+    Change the user agent of a running browser without relaunching it.
+    
+    Args:
+        browser: The browser instance
+        user_agent: User agent string to send from now on
+        
+    Returns:
+        True if the override was applied, False if CDP is not available
+    """
+    try:
+        browser.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+        return True
+    except Exception as e:
+        print(f"Could not override user agent: {e}")
+        return False
+
 def element_exists(browser, selector, by=By.CSS_SELECTOR):
     """
     Check if an element exists on the page.
@@ -179,8 +548,206 @@ def element_exists(browser, selector, by=By.CSS_SELECTOR):
     Returns:
         True if the element exists, False otherwise
     """
-    try:
-        browser.find_element(by, selector)
-        return True
-    except NoSuchElementException:
-        return False 
\ No newline at end of file
+    # One script round-trip either way, instead of a NoSuchElementException
+    # marshalled back over the wire protocol on every miss
+    if by == By.CSS_SELECTOR:
+        return browser.execute_script(CSS_ELEMENT_EXISTS_JS, selector)
+    if by == By.XPATH:
+        return browser.execute_script(XPATH_ELEMENT_EXISTS_JS, selector)
+    return len(browser.find_elements(by, selector)) > 0
+
+class BrowserPool:
+    """
+    Pool of warm browser instances reused across runs in the same process.
+    
+    Starting Chrome takes seconds and hundreds of MB, so released browsers are
+    kept (with cookies and storage cleared) and handed out again instead of
+    being quit. At most max_size browsers exist at once; acquire() blocks
+    while they are all checked out. A browser is recreated after max_reuse
+    uses so its memory doesn't keep growing. All pooled browsers are quit at
+    interpreter exit.
+    """
+    
+    def __init__(self, factory=None, max_reuse=20, clear_state=True, max_size=BROWSER_POOL_SIZE):
+        """
+        Initialize the pool.
+        
+        Args:
+            factory: Callable creating a new browser. Defaults to setup_browser.
+            max_reuse: Number of uses after which a browser is quit instead of reused
+            clear_state: Clear cookies, storage and HTTP cache when a browser is
+                released. Off for persistent profiles, whose state is meant to be kept.
+            max_size: Maximum number of browsers checked out or idle at once
+        """
+        self.factory = factory or setup_browser
+        self.max_reuse = max_reuse
+        self.clear_state = clear_state
+        self.max_size = max_size
+        self._idle = queue.Queue(maxsize=max_size)
+        # One slot per browser that may be checked out at once
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._browsers = []
+        self._uses = {}
+        atexit.register(self.close_all)
+    
+    def acquire(self, timeout=None):
+        """
+        Get an idle browser from the pool, or create a new one.
+        
+        Blocks while max_size browsers are checked out.
+        
+        Args:
+            timeout: Maximum time to wait for a free browser in seconds (None to
+                wait indefinitely)
+            
+        Returns:
+            A browser instance (None if one could not be created)
+            
+        Raises:
+            TimeoutError: If no browser became free within timeout
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"All {self.max_size} pooled browsers are in use")
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            browser = self.factory()
+        except Exception:
+            self._slots.release()
+            raise
+        if browser:
+            with self._lock:
+                self._browsers.append(browser)
+        else:
+            self._slots.release()
+        return browser
+    
+    def release(self, browser, clear_state=None):
+        """
+        Return a browser to the pool for reuse.
+        
+        Args:
+            browser: A browser obtained from acquire()
+            clear_state: Override the pool's clear_state for this browser
+        """
+        if not browser:
+            return
+        
+        # The next borrower must check the login state for itself; the session
+        # id stays the same even after the cookies are cleared
+        invalidate_login_state(browser)
+        try:
+            self._return(browser, self.clear_state if clear_state is None else clear_state)
+        finally:
+            self._slots.release()
+    
+    def _return(self, browser, clear_state):
+        """Reset a released browser and put it back on the idle queue, or quit it."""
+        with self._lock:
+            uses = self._uses[browser] = self._uses.get(browser, 0) + 1
+        if uses >= self.max_reuse:
+            self._discard(browser)
+            return
+        
+        try:
+            if clear_state:
+                self._clear_state(browser)
+            browser.get("about:blank")
+        except Exception as e:
+            # A browser that can't be reset is not reused
+            print(f"Discarding browser that could not be reset: {e}")
+            self._discard(browser)
+            return
+        
+        try:
+            self._idle.put_nowait(browser)
+        except queue.Full:
+            self._discard(browser)
+    
+    @staticmethod
+    def _clear_state(browser):
+        """
+        Clear a browser's cookies, site storage and HTTP cache.
+        
+        delete_all_cookies() only covers the current document's domain, so
+        cookies are cleared for every domain over CDP. Session storage,
+        local storage, IndexedDB and the like are cleared for the origin the
+        browser is on (Instagram, for the scrapers).
+        """
+        origin = browser.execute_script(CLEAR_SESSION_STORAGE_JS)
+        if origin and origin != "null":
+            browser.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        browser.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        browser.execute_cdp_cmd("Network.clearBrowserCache", {})
+    
+    @contextmanager
+    def session(self):
+        """
+        Borrow a browser for the duration of a with block.
+        
+        Yields:
+            A browser instance (None if one could not be created), released
+            back to the pool when the block exits
+        """
+        browser = self.acquire()
+        try:
+            yield browser
+        finally:
+            self.release(browser)
+    
+    def _discard(self, browser):
+        """Quit a browser and forget it."""
+        with self._lock:
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+            self._uses.pop(browser, None)
+        try:
+            browser.quit()
+        except Exception:
+            pass
+    
+    def close_all(self):
+        """Quit every browser created by the pool."""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+            self._uses = {}
+        for browser in browsers:
+            try:
+                browser.quit()
+            except Exception:
+                pass
+        self._idle = queue.Queue(maxsize=self.max_size)
+
+# Global browser pool instance
+browser_pool = BrowserPool()
+
+# Pools of browsers on persistent Chrome profiles, keyed by profile directory
+_profile_pools = {}
+_profile_pools_lock = threading.Lock()
+
+def profile_browser_pool(profile_dir):
+    """
+    Get the browser pool for a persistent Chrome profile directory.
+    
+    Chrome locks a profile while it runs, so each profile gets its own pool
+    holding a single browser: a second acquire() waits until the first one is
+    released instead of launching another Chrome on the locked profile. Its
+    cookies and cache are kept when the browser is released.
+    
+    Args:
+        profile_dir: Chrome user data directory
+        
+    Returns:
+        BrowserPool creating browsers on that profile
+    """
+    with _profile_pools_lock:
+        pool = _profile_pools.get(profile_dir)
+        if pool is None:
+            pool = BrowserPool(lambda: setup_browser(profile_dir), clear_state=False, max_size=1)
+            _profile_pools[profile_dir] = pool
+        return pool
@@ -1,22 +1,43 @@
 import os
 import random
+import asyncio
 import json
 import time
 from datetime import datetime
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
 from selenium.common.exceptions import WebDriverException
 
-from src.utils.browser import setup_browser, random_sleep
+from src.utils.browser import (
+    browser_pool,
+    profile_browser_pool,
+    set_user_agent,
+    set_cookies,
+    random_sleep
+)
 from src.utils.logger import get_default_logger
 from src.config.config import (
     MAX_RETRIES,
     DELAY_BETWEEN_REQUESTS_MIN,
-    DELAY_BETWEEN_REQUESTS_MAX
+    DELAY_BETWEEN_REQUESTS_MAX,
+    PROFILES_DIR
 )
 
+# orjson encodes and decodes the cookie lists much faster; fall back to the
+# standard library when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Get logger
 logger = get_default_logger()
 
+# Delay multiplier per THROTTLE_TIER_SIZE requests in a session: x1 for the
+# first 50, x1.5 up to 100, x2 after that
+THROTTLE_TIER_SIZE = 50
+THROTTLE_DELAY_MULTIPLIERS = (1.0, 1.5, 2.0)
+
 class BrowserManager:
     """
     Manages browser instances with advanced features like:
@@ -31,8 +52,18 @@ class BrowserManager:
         self.browser = None
         self.session_start_time = None
         self.request_count = 0
+        # time.monotonic() of the last request; session_start_time stays a
+        # datetime for logging
         self.last_request_time = None
         self.user_agents = self._load_user_agents()
+        # Pool the current browser came from, the account it belongs to, and
+        # whether its persistent profile already existed when it was launched
+        self._pool = browser_pool
+        self._username = None
+        self._warm_profile = False
+        # Own random generator, so pooled managers don't share (or correlate
+        # through) the module-level random state
+        self._rng = random.Random(os.urandom(16))
         
     def _load_user_agents(self):
         """Load user agents from file or use defaults."""
@@ -46,26 +77,52 @@ class BrowserManager:
         ]
         
         try:
-            if os.path.exists(user_agents_file):
-                with open(user_agents_file, 'r') as f:
-                    agents = [line.strip() for line in f if line.strip()]
-                if agents:
-                    return agents
+            with open(user_agents_file, 'r') as f:
+                agents = [line.strip() for line in f if line.strip()]
+            if agents:
+                return agents
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Error loading user agents: {e}")
         
         return default_agents
     
-    def start_browser(self):
-        """Start a new browser instance with a random user agent."""
+    def start_browser(self, username=None):
+        """
+        Start a browser session with a random user agent.
+        
+        The browser is borrowed from a pool (the shared one, or the account's
+        profile pool), so a warm Chrome is reused when one is idle instead of
+        launching a new one. Its WebDriver
+        connection pool was already enlarged by setup_browser
+        (WEBDRIVER_POOL_MAXSIZE), so rapid or concurrent commands reuse
+        keep-alive sockets.
+        
+        Args:
+            username: Account the session is for. If given, Chrome runs on that
+                account's persistent profile under PROFILES_DIR, so its HTTP
+                cache and cookies carry over between runs.
+        """
         if self.browser:
             self.close_browser()
         
-        # Rotate user agent
-        user_agent = random.choice(self.user_agents)
-        os.environ['USER_AGENT'] = user_agent
+        self._username = username
+        if username:
+            profile_dir = os.path.join(PROFILES_DIR, username)
+            # Chrome creates the Default profile on first launch
+            self._warm_profile = os.path.isdir(os.path.join(profile_dir, "Default"))
+            self._pool = profile_browser_pool(profile_dir)
+        else:
+            self._warm_profile = False
+            self._pool = browser_pool
         
-        self.browser = setup_browser()
+        self.browser = self._pool.acquire()
+        
+        # Rotate user agent; applied over CDP since the pooled Chrome is already running
+        user_agent = self._rng.choice(self.user_agents)
+        if self.browser:
+            set_user_agent(self.browser, user_agent)
         self.session_start_time = datetime.now()
         self.request_count = 0
         self.last_request_time = None
@@ -73,22 +130,41 @@ class BrowserManager:
         logger.info(f"Started new browser session with user agent: {user_agent}")
         return self.browser
     
-    def close_browser(self):
-        """Safely close the browser."""
+    def close_browser(self, clear_state=None):
+        """
+        Return the browser to its pool.
+        
+        The shared pool clears its cookies, storage and cache; a persistent
+        profile keeps them.
+        
+        Args:
+            clear_state: Override whether the browser's state is cleared
+        """
         if self.browser:
             try:
-                self.browser.quit()
-                logger.info("Browser closed successfully")
+                self._pool.release(self.browser, clear_state=clear_state)
+                logger.info("Browser returned to pool")
             except Exception as e:
-                logger.error(f"Error closing browser: {e}")
+                logger.error(f"Error releasing browser: {e}")
             finally:
                 self.browser = None
     
     def restart_browser(self):
-        """Restart the browser with a new user agent."""
+        """
+        Restart the browser session with a new user agent.
+        
+        Restarts follow a possible detection or ban, so the browser's cookies,
+        storage and cache are cleared even on a persistent profile, and the
+        session starts as clean as a freshly launched browser would. The
+        pooled browser is then reused rather than quit and relaunched; a
+        browser that can't be reset is replaced by the pool.
+        """
         logger.info("Restarting browser...")
-        self.close_browser()
-        return self.start_browser()
+        self.close_browser(clear_state=True)
+        browser = self.start_browser(self._username)
+        # The profile's saved state is gone
+        self._warm_profile = False
+        return browser
     
     def execute_with_retry(self, func, *args, max_retries=None, **kwargs):
         """
@@ -116,57 +192,131 @@ class BrowserManager:
                 
                 # Execute the function
                 result = func(*args, **kwargs)
-                
-                # Update request count
-                self.request_count += 1
-                self.last_request_time = datetime.now()
-                
+                self._record_request()
                 return result
             
             except WebDriverException as e:
                 last_exception = e
                 retries += 1
                 
-                logger.warning(f"Request failed (attempt {retries}/{max_retries}): {str(e)}")
-                
-                if "detected" in str(e).lower() or "automation" in str(e).lower():
-                    logger.warning("Possible detection, restarting browser...")
+                restart, wait_time = self._plan_retry(e, retries, max_retries)
+                if restart:
                     self.restart_browser()
-                
-                # Exponential backoff
-                wait_time = 2 ** retries + random.uniform(0, 1)
-                logger.info(f"Waiting {wait_time:.2f} seconds before retry...")
                 time.sleep(wait_time)
         
         logger.error(f"Failed after {max_retries} retries: {last_exception}")
         raise last_exception
     
+    async def aexecute_with_retry(self, func, *args, max_retries=None, **kwargs):
+        """
+        Async version of execute_with_retry.
+        
+        The (blocking) Selenium call runs in a worker thread and the throttle
+        and backoff delays are awaited, so several managers (e.g. one per
+        account) can be driven together with asyncio.gather and their waits
+        overlap instead of adding up.
+        
+        Args:
+            func: The function to execute
+            *args: Arguments to pass to the function
+            max_retries: Maximum number of retries (default: from config)
+            **kwargs: Keyword arguments to pass to the function
+            
+        Returns:
+            The result of the function call
+        """
+        if max_retries is None:
+            max_retries = MAX_RETRIES
+            
+        retries = 0
+        last_exception = None
+        
+        while retries <= max_retries:
+            try:
+                # Add delay between requests
+                sleep_time = self._throttle_delay()
+                if sleep_time > 0:
+                    logger.debug(f"Throttling request, sleeping for {sleep_time:.2f} seconds...")
+                    await asyncio.sleep(sleep_time)
+                
+                # Execute the function
+                result = await asyncio.to_thread(func, *args, **kwargs)
+                self._record_request()
+                return result
+            
+            except WebDriverException as e:
+                last_exception = e
+                retries += 1
+                
+                restart, wait_time = self._plan_retry(e, retries, max_retries)
+                if restart:
+                    await asyncio.to_thread(self.restart_browser)
+                await asyncio.sleep(wait_time)
+        
+        logger.error(f"Failed after {max_retries} retries: {last_exception}")
+        raise last_exception
+    
+    def _record_request(self):
+        """Count a successful request and note when it finished."""
+        self.request_count += 1
+        self.last_request_time = time.monotonic()
+    
+    def _plan_retry(self, error, retries, max_retries):
+        """
+        Decide how to retry a failed request.
+        
+        Shared by execute_with_retry and aexecute_with_retry, which only differ
+        in how they restart and wait.
+        
+        Args:
+            error: The WebDriverException the request failed with
+            retries: Number of failed attempts so far
+            max_retries: Maximum number of retries
+            
+        Returns:
+            Tuple of (whether to restart the browser, seconds to wait)
+        """
+        logger.warning(f"Request failed (attempt {retries}/{max_retries}): {str(error)}")
+        
+        message = str(error).lower()
+        restart = "detected" in message or "automation" in message
+        if restart:
+            logger.warning("Possible detection, restarting browser...")
+        
+        # Exponential backoff
+        wait_time = 2 ** retries + self._rng.uniform(0, 1)
+        logger.info(f"Waiting {wait_time:.2f} seconds before retry...")
+        return restart, wait_time
+    
     def _throttle_request(self):
         """Add random delay between requests to avoid detection."""
-        if self.last_request_time:
-            # Calculate time since last request
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            
-            # Determine delay based on request count (more requests = longer delays)
-            min_delay = DELAY_BETWEEN_REQUESTS_MIN
-            max_delay = DELAY_BETWEEN_REQUESTS_MAX
-            
-            # Adjust delay based on request count
-            if self.request_count > 50:
-                min_delay *= 1.5
-                max_delay *= 1.5
-            elif self.request_count > 100:
-                min_delay *= 2
-                max_delay *= 2
-            
-            # Calculate required delay
-            required_delay = random.uniform(min_delay, max_delay)
-            
-            # Sleep if needed
-            if elapsed < required_delay:
-                sleep_time = required_delay - elapsed
-                logger.debug(f"Throttling request, sleeping for {sleep_time:.2f} seconds...")
-                time.sleep(sleep_time)
+        sleep_time = self._throttle_delay()
+        if sleep_time > 0:
+            logger.debug(f"Throttling request, sleeping for {sleep_time:.2f} seconds...")
+            time.sleep(sleep_time)
+    
+    def _throttle_delay(self):
+        """
+        Get how long to wait before the next request to avoid detection.
+        
+        Returns:
+            Seconds to wait (0 if enough time has already passed)
+        """
+        if self.last_request_time is None:
+            return 0
+        
+        # Calculate time since last request
+        elapsed = time.monotonic() - self.last_request_time
+        
+        # Determine delay based on request count (more requests = longer delays)
+        tier = min(self.request_count // THROTTLE_TIER_SIZE, len(THROTTLE_DELAY_MULTIPLIERS) - 1)
+        multiplier = THROTTLE_DELAY_MULTIPLIERS[tier]
+        
+        # Calculate required delay
+        required_delay = self._rng.uniform(DELAY_BETWEEN_REQUESTS_MIN * multiplier,
+                                        DELAY_BETWEEN_REQUESTS_MAX * multiplier)
+        
+        return max(0, required_delay - elapsed)
     
     def simulate_human_behavior(self):
         """Simulate human-like behavior to avoid detection."""
@@ -175,22 +325,22 @@ class BrowserManager:
         
         try:
             # Random scrolling
-            scroll_amount = random.randint(100, 800)
+            scroll_amount = self._rng.randint(100, 800)
             self.browser.execute_script(f"window.scrollBy(0, {scroll_amount});")
-            random_sleep(0.5, 2)
+            random_sleep(0.5, 2, rng=self._rng)
             
-            # Random mouse movements
+            # Random mouse movements, with the pauses run by the browser so the
+            # whole gesture is sent in a single perform()
             actions = ActionChains(self.browser)
-            for _ in range(random.randint(1, 5)):
-                x = random.randint(0, 500)
-                y = random.randint(0, 500)
-                actions.move_by_offset(x, y)
-                actions.perform()
-                random_sleep(0.1, 0.5)
+            for _ in range(self._rng.randint(1, 5)):
+                x = self._rng.randint(0, 500)
+                y = self._rng.randint(0, 500)
+                actions.move_by_offset(x, y).pause(self._rng.uniform(0.1, 0.5))
             
-            # Reset mouse position
-            actions.move_to_element(self.browser.find_element_by_tag_name('body'))
-            actions.perform()
+            # Reset mouse position. body is looked up on every call: a cached
+            # element would be stale after each navigation.
+            body = self.browser.find_element(By.TAG_NAME, 'body')
+            actions.move_to_element(body).perform()
             
         except Exception as e:
             logger.debug(f"Error during human behavior simulation: {e}")
@@ -212,8 +362,12 @@ class BrowserManager:
                 "cookies": self.browser.get_cookies()
             }
             
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f)
+            if orjson is not None:
+                with open(session_file, 'wb') as f:
+                    f.write(orjson.dumps(session_data))
+            else:
+                with open(session_file, 'w') as f:
+                    json.dump(session_data, f)
                 
             logger.info(f"Session state saved to {session_file}")
             
@@ -224,28 +378,38 @@ class BrowserManager:
         """Load a previously saved session state."""
         session_file = os.path.join("data", "sessions", f"{username}_session.json")
         
-        if not os.path.exists(session_file):
+        # Open directly rather than checking os.path.exists first: one path
+        # lookup instead of two
+        try:
+            with open(session_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
             logger.info(f"No session file found for {username}")
             return False
+        except OSError as e:
+            logger.error(f"Error loading session state: {e}")
+            return False
         
         try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
+            session_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Start a new browser if needed
             if not self.browser:
-                self.start_browser()
+                self.start_browser(username)
             
-            # Load cookies
-            for cookie in session_data.get("cookies", []):
+            # A warm persistent profile already holds the account's cookies
+            if self._warm_profile:
+                logger.debug(f"Using cookies from persistent profile for {username}")
+            else:
+                # Load cookies in one CDP call instead of one add_cookie per cookie
                 try:
-                    self.browser.add_cookie(cookie)
+                    set_cookies(self.browser, session_data.get("cookies", []))
                 except Exception as e:
-                    logger.debug(f"Error adding cookie: {e}")
+                    logger.debug(f"Error adding cookies: {e}")
             
             # Update session info
             self.request_count = session_data.get("request_count", 0)
-            self.last_request_time = datetime.now()
+            self.last_request_time = time.monotonic()
             
             logger.info(f"Session state loaded from {session_file}")
             return True
@@ -1,10 +1,9 @@
 import os
 import base64
+import hashlib
 import json
 import getpass
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from dotenv import load_dotenv
 
 from src.utils.logger import get_default_logger
@@ -13,6 +12,7 @@ from src.utils.logger import get_default_logger
 logger = get_default_logger()
 
 # Constants
+KDF_ITERATIONS = 100000
 CREDENTIALS_DIR = "credentials"
 CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "encrypted_credentials.json")
 SALT_FILE = os.path.join(CREDENTIALS_DIR, "salt.bin")
@@ -23,6 +23,10 @@ class CredentialManager:
     Uses encryption to store credentials securely on disk.
     """
     
+    # Derived keys by digest of (password, salt), shared by all managers in the
+    # process so each new one skips PBKDF2 for a password already unlocked
+    _kdf_cache = {}
+    
     def __init__(self):
         """Initialize the credential manager."""
         # Create credentials directory if it doesn't exist
@@ -34,6 +38,16 @@ class CredentialManager:
         # Initialize encryption key
         self.key = None
     
+    @classmethod
+    def clear_key_cache(cls):
+        """
+        Drop every cached derived key, e.g. once the credentials are no longer needed.
+        
+        Keys are bytes, which can't be overwritten in place, so this only
+        removes the references; the next setup_encryption derives the key again.
+        """
+        cls._kdf_cache.clear()
+    
     def _generate_key(self, password, salt=None):
         """
         Generate an encryption key from a password and salt.
@@ -48,14 +62,14 @@ class CredentialManager:
         if salt is None:
             salt = os.urandom(16)
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        # Key the cache on a digest so the plain password isn't kept around
+        cache_key = hashlib.blake2b(password.encode() + salt, digest_size=16).digest()
+        key = self._kdf_cache.get(cache_key)
+        if key is None:
+            # hashlib calls OpenSSL's PBKDF2 directly; same key as cryptography's PBKDF2HMAC
+            raw_key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, KDF_ITERATIONS, dklen=32)
+            key = base64.urlsafe_b64encode(raw_key)
+            self._kdf_cache[cache_key] = key
         return key, salt
     
     def _save_salt(self, salt):
@@ -95,7 +109,7 @@ class CredentialManager:
             # Generate or load salt
             salt = self._load_salt()
             if salt is None:
-                _, salt = self._generate_key(master_password)
+                salt = os.urandom(16)
                 self._save_salt(salt)
             
             # Generate key
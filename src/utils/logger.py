@@ -1,6 +1,7 @@
 import os
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 def setup_logger(name, log_file=None, level=logging.INFO):
     """
@@ -22,9 +23,10 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Remove existing handlers to avoid duplicates
-    if logger.handlers:
-        logger.handlers = []
+    # Remove existing handlers to avoid duplicates, closing their files
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
     
     # Create formatter
     formatter = logging.Formatter(
@@ -49,6 +51,27 @@ def get_default_logger():
     """
     Get a default logger that logs to both console and a file.
     
+    The logger is configured once per day and cached; setup_logger replaces
+    the handlers (opening a new log file handle) every time it runs. A run
+    that crosses midnight switches to the new day's log file on its next
+    call, and since the logger object itself is shared, loggers fetched
+    earlier follow along.
+    
+    Returns:
+        A configured logger instance
+    """
+    # Create log file name with current date
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    return _get_logger_for_date(current_date)
+
+@lru_cache(maxsize=1)
+def _get_logger_for_date(current_date):
+    """
+    Configure the default logger to write to the log file for a date.
+    
+    Args:
+        current_date: Date string (YYYY-MM-DD) used in the log file name
+        
     Returns:
         A configured logger instance
     """
@@ -56,8 +79,6 @@ def get_default_logger():
     logs_dir = 'logs'
     os.makedirs(logs_dir, exist_ok=True)
     
-    # Create log file name with current date
-    current_date = datetime.now().strftime('%Y-%m-%d')
     log_file = os.path.join(logs_dir, f'instagram_scraper_{current_date}.log')
     
-    return setup_logger('instagram_scraper', log_file) 
\ No newline at end of file
+    return setup_logger('instagram_scraper', log_file)
\ No newline at end of file